@@ -1,19 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import time
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
 
 from packaging.version import Version, InvalidVersion
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED, ConfigEntry, ConfigEntryChange
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.components import mqtt
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.loader import async_get_integration
 
 from .const import (
@@ -32,6 +36,8 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_DEVICE_MODEL,
     DEFAULT_MQTT_PORT,
+    get_backup_device_info,
+    get_device_info,
     get_mqtt_root,
     get_mqtt_topics,
 )
@@ -54,6 +60,40 @@ LAST_CLEANUP_VERSION_KEY = "last_cleanup_version"
 LAST_DEPLOY_VERSION_KEY = "last_deploy_version"
 PERFORM_MQTT_CLEANUP = True
 
+# discovery configs published by older versions that used MQTT auto-discovery
+_TOPICS_TO_CLEAR: tuple[str, ...] = (
+    "unas_uptime",
+    "unas_os_version",
+    "unas_drive_version",
+    "unas_cpu_usage",
+    "unas_memory_used",
+    "unas_memory_total",
+    "unas_memory_usage",
+    "unas_cpu",
+    "unas_fan_speed",
+    "unas_fan_speed_percent",
+    *(
+        f"unas_pool{i}_{metric}"
+        for i in range(1, 6)
+        for metric in ("usage", "size", "used", "available")
+    ),
+    *(
+        f"unas_hdd_{bay}_{metric}"
+        for bay in range(1, 8)
+        for metric in (
+            "temperature",
+            "model",
+            "serial",
+            "rpm",
+            "firmware",
+            "status",
+            "total_size",
+            "power_hours",
+            "bad_sectors",
+        )
+    ),
+)
+
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.version == 1:
@@ -68,13 +108,20 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_version(version: str) -> Version:
+    return Version(version.replace("-dev", ""))
+
+
 def _version_at_least(stored: str | None, target: str) -> bool:
     if stored is None:
         return False
+    if stored == target:
+        return True
     try:
-        return Version(stored.replace("-dev", "")) >= Version(target.replace("-dev", ""))
+        return _parse_version(stored) >= _parse_version(target)
     except InvalidVersion:
-        return stored == target
+        return False
 
 
 async def _cleanup_old_mqtt_configs_on_upgrade(
@@ -96,57 +143,28 @@ async def _cleanup_old_mqtt_configs_on_upgrade(
         current_version,
     )
 
-    topics_to_clear = [
-        "unas_uptime",
-        "unas_os_version",
-        "unas_drive_version",
-        "unas_cpu_usage",
-        "unas_memory_used",
-        "unas_memory_total",
-        "unas_memory_usage",
-        "unas_cpu",
-        "unas_fan_speed",
-        "unas_fan_speed_percent",
-    ]
-
-    for i in range(1, 6):
-        topics_to_clear.extend(
-            [
-                f"unas_pool{i}_usage",
-                f"unas_pool{i}_size",
-                f"unas_pool{i}_used",
-                f"unas_pool{i}_available",
-            ]
-        )
-
-    for bay in range(1, 8):
-        topics_to_clear.extend(
-            [
-                f"unas_hdd_{bay}_temperature",
-                f"unas_hdd_{bay}_model",
-                f"unas_hdd_{bay}_serial",
-                f"unas_hdd_{bay}_rpm",
-                f"unas_hdd_{bay}_firmware",
-                f"unas_hdd_{bay}_status",
-                f"unas_hdd_{bay}_total_size",
-                f"unas_hdd_{bay}_power_hours",
-                f"unas_hdd_{bay}_bad_sectors",
-            ]
-        )
-
-    cleared_count = 0
-    for topic in topics_to_clear:
-        try:
-            await mqtt.async_publish(
+    # HA has no batch publish; qos=0 lets these go out together without waiting
+    # on a PUBACK each, qos=1 would serialize them on the broker round trip
+    results = await asyncio.gather(
+        *(
+            mqtt.async_publish(
                 hass,
                 f"homeassistant/sensor/{topic}/config",
                 "",
                 qos=0,
                 retain=True,
             )
+            for topic in _TOPICS_TO_CLEAR
+        ),
+        return_exceptions=True,
+    )
+
+    cleared_count = 0
+    for topic, result in zip(_TOPICS_TO_CLEAR, results):
+        if isinstance(result, Exception):
+            _LOGGER.debug("Failed to clear MQTT config for %s: %s", topic, result)
+        else:
             cleared_count += 1
-        except Exception as err:
-            _LOGGER.debug("Failed to clear MQTT config for %s: %s", topic, err)
 
     _LOGGER.info("Cleared %d old MQTT auto-discovery configs", cleared_count)
 
@@ -156,6 +174,9 @@ async def _cleanup_old_mqtt_configs_on_upgrade(
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if mqtt.DOMAIN not in hass.data:
+        raise ConfigEntryNotReady("MQTT integration is required but not loaded")
+
     manager = SSHManager(
         host=entry.data[CONF_HOST],
         username=entry.data[CONF_USERNAME],
@@ -174,6 +195,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     is_dev_version = '-dev' in current_version
     device_model = entry.data[CONF_DEVICE_MODEL]
     is_existing_installation = last_deploy_version is not None
+    topics = get_mqtt_topics(entry.entry_id)
 
     ssh_connected = False
     try:
@@ -183,8 +205,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         scripts_installed = await manager.scripts_installed()
         if last_deploy_version != current_version or not scripts_installed or is_dev_version:
-            mqtt_root = get_mqtt_topics(entry.entry_id)["root"]
-            await manager.deploy_scripts(device_model, mqtt_root)
+            await manager.deploy_scripts(device_model, topics["root"])
             new_data = dict(entry.data)
             new_data[LAST_DEPLOY_VERSION_KEY] = current_version
             hass.config_entries.async_update_entry(entry, data=new_data)
@@ -207,6 +228,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     mqtt_client_instance = UNASMQTTClient(hass, entry.entry_id)
     coordinator = UNASDataUpdateCoordinator(hass, manager, mqtt_client_instance, entry, pending_script_deploy)
     mqtt_client_instance._coordinator = coordinator
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_CONFIG_ENTRY_CHANGED, coordinator.async_mqtt_entry_changed)
+    )
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -219,16 +243,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     await mqtt_client_instance.async_subscribe()
-    await _cleanup_old_mqtt_configs_on_upgrade(hass, entry)
 
-    topics = get_mqtt_topics(entry.entry_id)
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    await mqtt.async_publish(
-        hass,
-        f"{topics['control']}/monitor_interval",
-        str(scan_interval),
-        qos=0,
-        retain=True,
+    await asyncio.gather(
+        _cleanup_old_mqtt_configs_on_upgrade(hass, entry),
+        mqtt.async_publish(
+            hass,
+            f"{topics['control']}/monitor_interval",
+            str(scan_interval),
+            qos=0,
+            retain=True,
+        ),
     )
 
     return True
@@ -248,8 +273,7 @@ async def _clear_retained_mqtt_topics(hass: HomeAssistant, entry_id: str) -> Non
         unsub = await mqtt.async_subscribe(hass, f"{mqtt_root}/#", on_message, qos=0)
         await asyncio.sleep(0.5)
         unsub()
-        for topic in collected:
-            await mqtt.async_publish(hass, topic, "", qos=0, retain=True)
+        await asyncio.gather(*(mqtt.async_publish(hass, topic, "", qos=0, retain=True) for topic in collected))
         if collected:
             _LOGGER.info("Cleared %d retained MQTT topics under %s", len(collected), mqtt_root)
     except Exception:
@@ -264,25 +288,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         manager = data["ssh_manager"]
         try:
-            await manager.execute_command("systemctl stop unas_monitor || true")
-            await manager.execute_command("systemctl stop fan_control || true")
-            await manager.execute_command("systemctl disable unas_monitor || true")
-            await manager.execute_command("systemctl disable fan_control || true")
-            await manager.execute_command("rm -f /etc/systemd/system/unas_monitor.service")
-            await manager.execute_command("rm -f /etc/systemd/system/fan_control.service")
-            await manager.execute_command("rm -f /root/unas_monitor.py")
-            await manager.execute_command("rm -f /root/fan_control.sh")
-            await manager.execute_command("rm -f /tmp/fan_control_last_pwm")
-            await manager.execute_command("rm -f /tmp/fan_control_state")
-            await manager.execute_command("rm -f /tmp/unas_hdd_temp")
-            await manager.execute_command("rm -f /tmp/unas_monitor_interval")
-            await manager.execute_command("rm -f /var/log/fan_control.log /var/log/fan_control.log.[1-9]")
-            await manager.execute_command("systemctl daemon-reload")
-            await manager.execute_command("apt remove mosquitto-clients -y")
-            await manager.execute_command("pip3 uninstall paho-mqtt -y")
-            await manager.execute_command("apt remove python3-pip -y")
-            await manager.execute_command("echo 2 > /sys/class/hwmon/hwmon0/pwm1_enable || true")
-            await manager.execute_command("echo 2 > /sys/class/hwmon/hwmon0/pwm2_enable || true")
+            await manager.execute_command(
+                "systemctl stop unas_monitor fan_control || true; "
+                "systemctl disable unas_monitor fan_control || true"
+            )
+            await manager.execute_command(
+                "rm -f /etc/systemd/system/unas_monitor.service /etc/systemd/system/fan_control.service "
+                "/root/unas_monitor.py /root/fan_control.sh "
+                "/tmp/fan_control_last_pwm /tmp/fan_control_state /tmp/unas_hdd_temp /tmp/unas_monitor_interval "
+                "/tmp/unas_monitor_state.json /tmp/unas_monitor_state.json.tmp "
+                "/var/log/fan_control.log /var/log/fan_control.log.[1-9]; "
+                "systemctl daemon-reload"
+            )
+            await manager.execute_command(
+                "apt remove mosquitto-clients -y; "
+                "pip3 uninstall paho-mqtt -y; "
+                "apt remove python3-pip -y"
+            )
+            await manager.execute_command(
+                "echo 2 > /sys/class/hwmon/hwmon0/pwm1_enable || true; "
+                "echo 2 > /sys/class/hwmon/hwmon0/pwm2_enable || true"
+            )
         except Exception as err:
             _LOGGER.error("Failed to clean up UNAS (non-critical): %s", err)
 
@@ -305,6 +331,19 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.pending_script_deploy = pending_script_deploy
         self.ssh_failed_since: float | None = None
+        # refreshed when an mqtt config entry changes instead of checked every poll
+        self.mqtt_available = mqtt.DOMAIN in hass.data
+        # fan control entities read this instead of re-checking on every state read
+        self.fan_control_available = False
+        self.topics = get_mqtt_topics(entry.entry_id)
+        device_name, device_model = get_device_info(entry.data)
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=device_name,
+            manufacturer="Ubiquiti",
+            model=device_model,
+        )
+        self._backup_device_info: dict[str, tuple[tuple, DeviceInfo]] = {}
         self.discovered_bays: set[str] = set()
         self.discovered_nvmes: set[str] = set()
         self.discovered_pools: set[str] = set()
@@ -312,9 +351,11 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
         self.discovered_backup_task_sensors: set[str] = set()
         self.discovered_backup_task_buttons: set[str] = set()
         self.discovered_backup_task_switches: set[str] = set()
-        self.sensor_add_entities = None
-        self.button_add_entities = None
-        self.switch_add_entities = None
+        # last backup task ids each platform reconciled, keyed by entity domain
+        self.backup_task_fingerprints: dict[str, frozenset[str]] = {}
+        self.discovery_handlers: list[Callable[[], Awaitable[None]]] = []
+        # set by the mqtt client when a telemetry key shows up for the first time
+        self.new_data_event = asyncio.Event()
 
         super().__init__(
             hass,
@@ -323,8 +364,13 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
         )
 
+    @callback
+    def async_mqtt_entry_changed(self, change: ConfigEntryChange, entry: ConfigEntry) -> None:
+        if entry.domain == mqtt.DOMAIN:
+            self.mqtt_available = mqtt.DOMAIN in self.hass.data
+
     async def _async_update_data(self):
-        if mqtt.DOMAIN not in self.hass.data:
+        if not self.mqtt_available:
             _LOGGER.error("MQTT integration removed - UNAS Pro requires MQTT")
             ir.async_create_issue(
                 self.hass,
@@ -372,8 +418,7 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
                 reason = "missing" if not scripts_installed else "pending upgrade"
                 _LOGGER.info("Scripts %s, deploying...", reason)
                 device_model = self.entry.data[CONF_DEVICE_MODEL]
-                mqtt_root = get_mqtt_topics(self.entry.entry_id)["root"]
-                await self.ssh_manager.deploy_scripts(device_model, mqtt_root)
+                await self.ssh_manager.deploy_scripts(device_model, self.topics["root"])
                 self.pending_script_deploy = False
                 integration = await async_get_integration(self.hass, DOMAIN)
                 new_data = dict(self.entry.data)
@@ -381,14 +426,13 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
                 self.hass.config_entries.async_update_entry(self.entry, data=new_data)
                 scripts_installed = True
 
-            monitor_running = await self.ssh_manager.service_running("unas_monitor")
-            fan_control_running = await self.ssh_manager.service_running("fan_control")
+            services = await self.ssh_manager.services_running(["unas_monitor", "fan_control"])
 
             data.update({
                 "scripts_installed": scripts_installed,
                 "ssh_connected": True,
-                "monitor_running": monitor_running,
-                "fan_control_running": fan_control_running,
+                "monitor_running": services["unas_monitor"],
+                "fan_control_running": services["fan_control"],
             })
 
             if self.ssh_failed_since is not None:
@@ -406,6 +450,7 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
             except Exception as err:
                 _LOGGER.debug("Could not fetch backup tasks: %s", err)
                 data["backup_tasks"] = []
+            data["backup_task_ids"] = {task["id"] for task in data["backup_tasks"]}
 
         except Exception as err:
             _LOGGER.warning("SSH connection temporarily unavailable: %s", err)
@@ -426,33 +471,29 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
                     },
                 )
 
-        try:
-            if self.sensor_add_entities is not None:
-                from .sensor import (
-                    _discover_and_add_drive_sensors,
-                    _discover_and_add_nvme_sensors,
-                    _discover_and_add_pool_sensors,
-                    _discover_and_add_share_sensors,
-                    _discover_and_add_backup_sensors,
-                )
-                await _discover_and_add_drive_sensors(self, self.sensor_add_entities)
-                await _discover_and_add_nvme_sensors(self, self.sensor_add_entities)
-                await _discover_and_add_pool_sensors(self, self.sensor_add_entities)
-                await _discover_and_add_share_sensors(self, self.sensor_add_entities)
-                await _discover_and_add_backup_sensors(self, self.sensor_add_entities)
-
-            if self.button_add_entities is not None:
-                from .button import _discover_and_add_backup_buttons
-                await _discover_and_add_backup_buttons(self, self.button_add_entities)
-
-            if self.switch_add_entities is not None:
-                from .switch import _discover_and_add_backup_switches
-                await _discover_and_add_backup_switches(self, self.switch_add_entities)
-        except Exception as err:
-            _LOGGER.error("Error during entity discovery: %s", err)
+        self.fan_control_available = self.mqtt_client.is_available() and data["fan_control_running"]
+
+        # registered by the sensor, button and switch platforms during setup; each
+        # handles a disjoint set of entities so they can run side by side
+        results = await asyncio.gather(
+            *(discover() for discover in self.discovery_handlers),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Error during entity discovery: %s", result)
 
         return data
 
+    def backup_device_info(self, task: dict) -> DeviceInfo:
+        remote = task.get("remote", {})
+        key = (task["name"], remote.get("type"), remote.get("oauth2Account") or task.get("destinationDir", ""))
+        cached = self._backup_device_info.get(task["id"])
+        if cached is None or cached[0] != key:
+            cached = (key, get_backup_device_info(self.entry.entry_id, self.entry.data, task))
+            self._backup_device_info[task["id"]] = cached
+        return cached[1]
+
     def find_backup_task(self, task_id: str):
         for task in self.data.get("backup_tasks", []):
             if task["id"] == task_id:
@@ -461,6 +502,5 @@ class UNASDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def async_reinstall_scripts(self) -> None:
         device_model = self.entry.data[CONF_DEVICE_MODEL]
-        mqtt_root = get_mqtt_topics(self.entry.entry_id)["root"]
-        await self.ssh_manager.deploy_scripts(device_model, mqtt_root)
+        await self.ssh_manager.deploy_scripts(device_model, self.topics["root"])
         await self.async_request_refresh()
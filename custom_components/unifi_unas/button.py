@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import functools
 import logging
+from collections.abc import Awaitable, Callable
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
@@ -8,13 +10,19 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import DeviceInfo
 
 from . import UNASDataUpdateCoordinator
-from .const import DOMAIN, get_backup_device_info, get_device_info
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# button definitions: (name, unique_id_suffix, icon, press)
+SYSTEM_BUTTONS = [
+    ("Reinstall Scripts", "reinstall_scripts", "mdi:cog-refresh", lambda c: c.async_reinstall_scripts()),
+    ("Reboot", "reboot", "mdi:restart", lambda c: c.ssh_manager.execute_command_detached("reboot")),
+    ("Shutdown", "shutdown", "mdi:power", lambda c: c.ssh_manager.execute_command_detached("shutdown -h now")),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -25,82 +33,45 @@ async def async_setup_entry(
         "coordinator"
     ]
 
-    async_add_entities([
-        UNASReinstallScriptsButton(coordinator),
-        UNASRebootButton(coordinator),
-        UNASShutdownButton(coordinator),
-    ])
-
-    coordinator.button_add_entities = async_add_entities
-
+    async_add_entities(
+        UNASSystemButton(coordinator, name, key, icon, press) for name, key, icon, press in SYSTEM_BUTTONS
+    )
 
-class UNASReinstallScriptsButton(CoordinatorEntity, ButtonEntity):
-    def __init__(self, coordinator: UNASDataUpdateCoordinator) -> None:
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._attr_name = "Reinstall Scripts"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_reinstall_scripts"
-        self._attr_icon = "mdi:cog-refresh"
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
-
-    @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success and self.coordinator.data.get("ssh_connected", False)
-
-    async def async_press(self) -> None:
-        await self.coordinator.async_reinstall_scripts()
+    coordinator.discovery_handlers.append(
+        functools.partial(_discover_and_add_backup_buttons, coordinator, async_add_entities)
+    )
 
 
-class UNASRebootButton(CoordinatorEntity, ButtonEntity):
-    def __init__(self, coordinator: UNASDataUpdateCoordinator) -> None:
-        super().__init__(coordinator)
-        self._attr_has_entity_name = True
-        self._attr_name = "Reboot"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_reboot"
-        self._attr_icon = "mdi:restart"
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+class _SSHConnectedMixin:
+    __slots__ = ()
 
     @property
     def available(self) -> bool:
-        return self.coordinator.last_update_success and self.coordinator.data.get("ssh_connected", False)
+        coordinator = self.coordinator
+        return coordinator.last_update_success and coordinator.data.get("ssh_connected", False)
 
-    async def async_press(self) -> None:
-        await self.coordinator.ssh_manager.execute_command("reboot")
 
+class UNASSystemButton(_SSHConnectedMixin, CoordinatorEntity, ButtonEntity):
+    __slots__ = ("_press",)
 
-class UNASShutdownButton(CoordinatorEntity, ButtonEntity):
-    def __init__(self, coordinator: UNASDataUpdateCoordinator) -> None:
+    def __init__(
+            self,
+            coordinator: UNASDataUpdateCoordinator,
+            name: str,
+            key: str,
+            icon: str,
+            press: Callable[[UNASDataUpdateCoordinator], Awaitable],
+    ) -> None:
         super().__init__(coordinator)
+        self._press = press
         self._attr_has_entity_name = True
-        self._attr_name = "Shutdown"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_shutdown"
-        self._attr_icon = "mdi:power"
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
-
-    @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success and self.coordinator.data.get("ssh_connected", False)
+        self._attr_name = name
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
+        self._attr_icon = icon
+        self._attr_device_info = coordinator.device_info
 
     async def async_press(self) -> None:
-        await self.coordinator.ssh_manager.execute_command("shutdown -h now")
+        await self._press(self.coordinator)
 
 
 async def _discover_and_add_backup_buttons(
@@ -110,7 +81,10 @@ async def _discover_and_add_backup_buttons(
     from homeassistant.helpers import entity_registry as er
 
     backup_tasks = coordinator.data.get("backup_tasks", [])
-    task_ids = {task["id"] for task in backup_tasks}
+    task_ids = frozenset(coordinator.data.get("backup_task_ids", ()))
+    # only recorded once the entities are reconciled, so a failed pass is retried next poll
+    if coordinator.backup_task_fingerprints.get("button") == task_ids:
+        return
 
     entity_reg = er.async_get(coordinator.hass)
     entry_id = coordinator.entry.entry_id
@@ -126,18 +100,20 @@ async def _discover_and_add_backup_buttons(
                 entity_reg.async_remove(entity_id)
                 _LOGGER.debug("Removed backup button entity %s", entity_id)
 
-    # clean up orphaned entities from previous sessions if needed
+    # clean up orphaned entities from previous sessions; like the rest of this pass it
+    # only runs on the first poll and when the task set changes
     prefix = f"{entry_id}_backup_"
+    plen = len(prefix)
     for entity in er.async_entries_for_config_entry(entity_reg, entry_id):
-        if entity.domain != "button" or not entity.unique_id.startswith(prefix):
+        if entity.domain != "button" or not (uid := entity.unique_id).startswith(prefix):
             continue
-        task_id = entity.unique_id[len(prefix):]
-        if task_id not in task_ids:
+        if uid[plen:] not in task_ids:
             entity_reg.async_remove(entity.entity_id)
             _LOGGER.info("Removed orphaned backup button %s", entity.entity_id)
 
     new_tasks = task_ids - coordinator.discovered_backup_task_buttons
     if not new_tasks:
+        coordinator.backup_task_fingerprints["button"] = task_ids
         return
 
     entities = []
@@ -150,8 +126,12 @@ async def _discover_and_add_backup_buttons(
         coordinator.discovered_backup_task_buttons.update(new_tasks)
         _LOGGER.info("Added %d backup trigger buttons", len(entities))
 
+    coordinator.backup_task_fingerprints["button"] = task_ids
+
+
+class UNASBackupTriggerButton(_SSHConnectedMixin, CoordinatorEntity, ButtonEntity):
+    __slots__ = ("_task_id", "_task_name")
 
-class UNASBackupTriggerButton(CoordinatorEntity, ButtonEntity):
     def __init__(self, coordinator: UNASDataUpdateCoordinator, task: dict) -> None:
         super().__init__(coordinator)
         self._task_id = task["id"]
@@ -160,16 +140,11 @@ class UNASBackupTriggerButton(CoordinatorEntity, ButtonEntity):
         self._attr_name = "Run backup"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}"
         self._attr_icon = "mdi:cloud-upload"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self) -> bool:
-        if not self.coordinator.last_update_success:
-            return False
-        if not self.coordinator.data.get("ssh_connected", False):
-            return False
-        backup_tasks = self.coordinator.data.get("backup_tasks", [])
-        return any(task["id"] == self._task_id for task in backup_tasks)
+        return super().available and self._task_id in self.coordinator.data.get("backup_task_ids", ())
 
     async def async_press(self) -> None:
         result = await self.coordinator.ssh_manager.execute_backup_api(
@@ -41,12 +41,23 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_DEVICE_NAME,
     DEVICE_MODELS,
-    HA_SSH_KEY_PATHS,
+    find_default_ssh_key,
     get_mqtt_topics,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+DEVICE_MODEL_SELECTOR = SelectSelector(
+    SelectSelectorConfig(
+        options=[{"value": k, "label": v} for k, v in DEVICE_MODELS.items()],
+        mode=SelectSelectorMode.DROPDOWN,
+    )
+)
+SCAN_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL, mode=NumberSelectorMode.BOX)
+)
+MQTT_PORT_SELECTOR = NumberSelector(NumberSelectorConfig(min=1, max=65535, mode=NumberSelectorMode.BOX))
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
@@ -56,18 +67,9 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_MQTT_USER): str,
         vol.Required(CONF_MQTT_PASSWORD): str,
         vol.Optional(CONF_MQTT_TLS, default=False): BooleanSelector(),
-        vol.Required(CONF_DEVICE_MODEL, default=DEFAULT_DEVICE_MODEL): SelectSelector(
-            SelectSelectorConfig(
-                options=[{"value": k, "label": v} for k, v in DEVICE_MODELS.items()],
-                mode=SelectSelectorMode.DROPDOWN,
-            )
-        ),
+        vol.Required(CONF_DEVICE_MODEL, default=DEFAULT_DEVICE_MODEL): DEVICE_MODEL_SELECTOR,
         vol.Optional(CONF_DEVICE_NAME, default="UNAS"): str,
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): NumberSelector(
-            NumberSelectorConfig(
-                min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL, mode=NumberSelectorMode.BOX
-            )
-        ),
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): SCAN_INTERVAL_SELECTOR,
     }
 )
 
@@ -90,16 +92,12 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if new_model != old_model:
                 errors["base"] = "model_changed"
-            elif error_key := await self._test_ssh(user_input[CONF_HOST], user_input[CONF_USERNAME],
-                                                   user_input.get(CONF_PASSWORD)):
+            elif error_key := await self._test_connections(user_input, reuse_ssh=False):
                 errors["base"] = error_key
             elif user_input.get(CONF_MQTT_TLS):
                 self._pending_input = user_input
                 self._reconfigure_entry = entry
                 return await self.async_step_reconfigure_mqtt_tls()
-            elif error_key := await self._test_mqtt(user_input[CONF_MQTT_HOST], user_input[CONF_MQTT_USER],
-                                                    user_input[CONF_MQTT_PASSWORD]):
-                errors["base"] = error_key
             else:
                 await self.async_set_unique_id(user_input[CONF_HOST])
                 device_name = (
@@ -123,20 +121,13 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_MQTT_USER, default=entry.data[CONF_MQTT_USER]): str,
                 vol.Required(CONF_MQTT_PASSWORD, default=entry.data[CONF_MQTT_PASSWORD]): str,
                 vol.Optional(CONF_MQTT_TLS, default=entry.data.get(CONF_MQTT_TLS, False)): BooleanSelector(),
-                vol.Required(CONF_DEVICE_MODEL, default=old_model): SelectSelector(
-                    SelectSelectorConfig(
-                        options=[{"value": k, "label": v} for k, v in DEVICE_MODELS.items()],
-                        mode=SelectSelectorMode.DROPDOWN,
-                    )
-                ),
+                vol.Required(CONF_DEVICE_MODEL, default=old_model): DEVICE_MODEL_SELECTOR,
                 vol.Optional(
                     CONF_DEVICE_NAME,
                     default=entry.data.get(CONF_DEVICE_NAME) or "UNAS",
                 ): str,
                 vol.Optional(CONF_SCAN_INTERVAL,
-                             default=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): NumberSelector(
-                    NumberSelectorConfig(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL, mode=NumberSelectorMode.BOX)
-                ),
+                             default=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): SCAN_INTERVAL_SELECTOR,
             }
         )
 
@@ -181,9 +172,7 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(
                 CONF_MQTT_PORT,
                 default=entry.data.get(CONF_MQTT_PORT, DEFAULT_MQTT_TLS_PORT),
-            ): NumberSelector(
-                NumberSelectorConfig(min=1, max=65535, mode=NumberSelectorMode.BOX)
-            ),
+            ): MQTT_PORT_SELECTOR,
             vol.Optional(
                 CONF_MQTT_TLS_INSECURE,
                 default=entry.data.get(CONF_MQTT_TLS_INSECURE, False),
@@ -200,15 +189,11 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="mqtt_required")
 
         if user_input is not None:
-            if error_key := await self._test_ssh(user_input[CONF_HOST], user_input[CONF_USERNAME],
-                                                 user_input.get(CONF_PASSWORD)):
+            if error_key := await self._test_connections(user_input):
                 errors["base"] = error_key
             elif user_input.get(CONF_MQTT_TLS):
                 self._pending_input = user_input
                 return await self.async_step_mqtt_tls()
-            elif error_key := await self._test_mqtt(user_input[CONF_MQTT_HOST], user_input[CONF_MQTT_USER],
-                                                    user_input[CONF_MQTT_PASSWORD]):
-                errors["base"] = error_key
             else:
                 await self.async_set_unique_id(user_input[CONF_HOST])
                 self._abort_if_unique_id_configured()
@@ -251,22 +236,50 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         schema = vol.Schema({
-            vol.Optional(CONF_MQTT_PORT, default=DEFAULT_MQTT_TLS_PORT): NumberSelector(
-                NumberSelectorConfig(min=1, max=65535, mode=NumberSelectorMode.BOX)
-            ),
+            vol.Optional(CONF_MQTT_PORT, default=DEFAULT_MQTT_TLS_PORT): MQTT_PORT_SELECTOR,
             vol.Optional(CONF_MQTT_TLS_INSECURE, default=False): BooleanSelector(),
         })
         return self.async_show_form(step_id="mqtt_tls", data_schema=schema, errors=errors)
 
-    async def _test_ssh(self, host: str, username: str, password: str | None) -> str | None:
+    async def _test_connections(self, user_input: dict[str, Any], reuse_ssh: bool = True) -> str | None:
+        # run the probes side by side; TLS brokers are tested in the follow-up step
+        probes = [
+            self._test_ssh(user_input[CONF_HOST], user_input[CONF_USERNAME], user_input.get(CONF_PASSWORD), reuse_ssh)
+        ]
+        if not user_input.get(CONF_MQTT_TLS):
+            probes.append(
+                self._test_mqtt(user_input[CONF_MQTT_HOST], user_input[CONF_MQTT_USER], user_input[CONF_MQTT_PASSWORD])
+            )
+        for error_key in await asyncio.gather(*probes):
+            if error_key:
+                return error_key
+        return None
+
+    def _find_ssh_manager(self, host: str, username: str, password: str | None):
+        # a loaded entry for the same host and credentials already holds a live connection
+        for entry_data in self.hass.data.get(DOMAIN, {}).values():
+            manager = entry_data.get("ssh_manager")
+            if (
+                manager is not None
+                and manager.host == host
+                and manager.username == username
+                and (manager.password or None) == (password or None)
+            ):
+                return manager
+        return None
+
+    async def _test_ssh(self, host: str, username: str, password: str | None, reuse: bool = True) -> str | None:
         try:
+            # an open session authenticated in the past, so it says nothing about credentials
+            # the device may have changed since; reconfigure always logs in again
+            if reuse and (manager := self._find_ssh_manager(host, username, password)):
+                stdout, _ = await asyncio.wait_for(manager.execute_command("echo 'test'"), timeout=10.0)
+                return None if stdout.strip() == "test" else "unknown"
+
             client_keys = None
-            if not password:
-                for key_path in HA_SSH_KEY_PATHS:
-                    if key_path.exists():
-                        client_keys = [str(key_path)]
-                        _LOGGER.debug("Using SSH key from %s", key_path)
-                        break
+            if not password and (key_path := find_default_ssh_key()):
+                client_keys = [key_path]
+                _LOGGER.debug("Using SSH key from %s", key_path)
 
             conn = await asyncio.wait_for(
                 asyncssh.connect(
@@ -301,17 +314,22 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             import paho.mqtt.client as mqtt_client
 
             result = {"rc": None}
+            connected = asyncio.Event()
+            loop = asyncio.get_running_loop()
 
+            # on_connect runs on paho's network thread
             try:
                 client = mqtt_client.Client(mqtt_client.CallbackAPIVersion.VERSION2)
                 def on_connect(_client, _userdata, _flags, rc, _properties):
                     result["rc"] = rc
                     _client.disconnect()
+                    loop.call_soon_threadsafe(connected.set)
             except (AttributeError, TypeError):
                 client = mqtt_client.Client()
                 def on_connect(_client, _userdata, _flags, rc):
                     result["rc"] = rc
                     _client.disconnect()
+                    loop.call_soon_threadsafe(connected.set)
 
             import ssl
             client.username_pw_set(username, password)
@@ -324,7 +342,7 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             client.on_connect = on_connect
 
             try:
-                client.connect(host, int(port), 60)
+                await self.hass.async_add_executor_job(client.connect, host, int(port), 60)
             except Exception as e:
                 if isinstance(e, ssl.SSLCertVerificationError):
                     _LOGGER.debug("MQTT TLS certificate verification failed: %s", e)
@@ -333,8 +351,12 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return "mqtt_cannot_connect"
 
             client.loop_start()
-            await asyncio.sleep(3)
-            client.loop_stop()
+            try:
+                await asyncio.wait_for(connected.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                client.loop_stop()
 
             if result["rc"] == 0:
                 return None
@@ -354,8 +376,6 @@ class UNASProConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class UNASProOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input):
         if user_input is not None:
-            from homeassistant.components import mqtt
-
             new_interval = user_input[CONF_SCAN_INTERVAL]
             topics = get_mqtt_topics(self.config_entry.entry_id)
             await mqtt.async_publish(
@@ -377,8 +397,7 @@ class UNASProOptionsFlow(config_entries.OptionsFlow):
                 vol.Required(
                     CONF_SCAN_INTERVAL,
                     default=self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-                ): NumberSelector(
-                    NumberSelectorConfig(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL, mode=NumberSelectorMode.BOX)),
+                ): SCAN_INTERVAL_SELECTOR,
             }
         )
 
@@ -1,4 +1,7 @@
+import functools
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 
@@ -12,6 +15,7 @@ HA_SSH_KEY_PATHS = [
     Path.home() / ".ssh" / "id_rsa",
     Path.home() / ".ssh" / "id_ed25519",
 ]
+
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_MQTT_HOST = "mqtt_host"
@@ -53,6 +57,14 @@ DEVICE_MODELS = {
 }
 
 
+@functools.cache
+def find_default_ssh_key() -> str | None:
+    for key_path in HA_SSH_KEY_PATHS:
+        if key_path.exists():
+            return str(key_path)
+    return None
+
+
 def get_device_info(entry_data: dict) -> tuple[str, str]:
     device_model = entry_data[CONF_DEVICE_MODEL]
     custom_name = entry_data.get(CONF_DEVICE_NAME)
@@ -72,6 +84,7 @@ REMOTE_TYPE_LABELS = {
 }
 
 
+@functools.lru_cache(maxsize=32)
 def format_remote_type(remote_type):
     if not remote_type:
         return "Local"
@@ -89,12 +102,16 @@ def format_schedule(schedule):
 
 
 # MQTT topic structure
+@functools.lru_cache(maxsize=32)
 def get_mqtt_root(entry_id: str) -> str:
     return f"unas/{entry_id[:8]}"
 
-def get_mqtt_topics(entry_id: str):
+
+# cached per entry, so handed out read-only
+@functools.lru_cache(maxsize=32)
+def get_mqtt_topics(entry_id: str) -> Mapping[str, str]:
     root = get_mqtt_root(entry_id)
-    return {
+    return MappingProxyType({
         "root": root,
         "availability": f"{root}/availability",
         "control": f"{root}/control",
@@ -105,7 +122,9 @@ def get_mqtt_topics(entry_id: str):
         "smb": f"{root}/smb",
         "nfs": f"{root}/nfs",
         "share": f"{root}/share",
-    }
+        "fan_mode": f"{root}/control/fan/mode",
+        "fan_curve": f"{root}/control/fan/curve",
+    })
 
 
 def get_backup_device_info(entry_id: str, entry_data: dict, task: dict) -> DeviceInfo:
@@ -1,40 +1,60 @@
 from __future__ import annotations
 
-import logging
-
-from homeassistant.components import mqtt
 from homeassistant.core import callback
 
-_LOGGER = logging.getLogger(__name__)
+# mode payloads that map to themselves; a bare number means a fixed speed was set
+NAMED_FAN_MODES = frozenset({"unas_managed", "auto", "target_temp"})
+
+
+def parse_fan_mode(payload: str) -> str | None:
+    if payload in NAMED_FAN_MODES:
+        return payload
+    # int() alone would also take signs, whitespace and underscores
+    if payload.isdecimal() and int(payload) < 256:
+        return "set_speed"
+    return None
 
 
 class FanModeMixin:
+    __slots__ = ()
+
+    # class-level defaults, so these stay out of subclass __slots__
     _current_mode: str | None = None
     _unsubscribe_mode = None
-
-    async def _subscribe_fan_mode(self) -> None:
-        @callback
-        def mode_message_received(msg):
-            payload = msg.payload
-            if payload == "unas_managed":
-                self._current_mode = "unas_managed"
-            elif payload == "auto":
-                self._current_mode = "auto"
-            elif payload == "target_temp":
-                self._current_mode = "target_temp"
-            elif payload.isdigit():
-                self._current_mode = "set_speed"
-            else:
-                self._current_mode = None
-            self.async_write_ha_state()
-
-        self._unsubscribe_mode = await mqtt.async_subscribe(
-            self.hass, f"{self._topics['control']}/fan/mode", mode_message_received, qos=0
-        )
+    _write_scheduled = False
+    # entities that report the fan mode as a current_mode attribute set this
+    _mode_attribute = False
+
+    def _set_current_mode(self, mode: str | None) -> None:
+        self._current_mode = mode
+        if self._mode_attribute:
+            # rebuilt only on a mode change, not on every state write
+            self._attr_extra_state_attributes = {"current_mode": mode} if mode is not None else {}
+
+    def _subscribe_fan_mode(self) -> None:
+        mqtt_client = self.coordinator.mqtt_client
+        if (mode := mqtt_client.get_value("fan_mode")) is not None:
+            self._set_current_mode(parse_fan_mode(str(mode)))
+        self._unsubscribe_mode = mqtt_client.add_listener("fan_mode", self._fan_mode_received)
+
+    @callback
+    def _fan_mode_received(self, payload: str) -> None:
+        mode = parse_fan_mode(payload)
+        if mode != self._current_mode:
+            self._set_current_mode(mode)
+            self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        # mode and value messages often arrive together; write state once for both
+        if self._write_scheduled:
+            return
+        self._write_scheduled = True
+        self.hass.loop.call_soon(self._do_write)
+
+    def _do_write(self) -> None:
+        self._write_scheduled = False
+        self.async_write_ha_state()
 
     def _unsubscribe_fan_mode(self) -> None:
         if self._unsubscribe_mode:
-            try:
-                self._unsubscribe_mode()
-            except Exception as err:
-                _LOGGER.debug("Error unsubscribing from fan mode: %s", err)
+            self._unsubscribe_mode()
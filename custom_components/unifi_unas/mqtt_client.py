@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import json
+from collections.abc import Callable
 from typing import Any
-from datetime import datetime, timedelta
 
 from homeassistant.components import mqtt
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 
 from .const import get_mqtt_root
 
@@ -28,6 +28,7 @@ unas/system/{metric}                 → unas_{metric}                  → valu
 unas/hdd/{bay}/{metric}              → unas_hdd_{bay}_{metric}        → value
 unas/nvme/{slot}/{metric}            → unas_nvme_{slot}_{metric}      → value
 unas/pool/{num}/{metric}             → unas_pool{num}_{metric}        → value
+unas/.../state                       → one of the above per JSON key  → values
 unas/share/{name}/{metric}           → unas_share_{name}_{metric}     → value
 unas/smb/connections                 → unas_smb_connections           → value
 unas/smb/clients                     → unas_smb_connections           → attributes
@@ -37,8 +38,12 @@ unas/control/monitor_interval        → monitor_interval               → valu
 unas/control/fan/mode                → fan_mode                       → value
 unas/control/fan/curve/{param}       → fan_curve_{param}              → value
 
+The monitor publishes system, hdd, nvme and pool metrics as a JSON object on
+the device's state topic; each key is handled as if it arrived on its own topic.
+
 Examples:
   unas/system/cpu_temp         → unas_cpu_temp = 45
+  unas/hdd/1/state             → unas_hdd_1_temperature = 38, unas_hdd_1_model = ...
   unas/hdd/1/temperature       → unas_hdd_1_temperature = 38
   unas/nvme/0/percentage_used  → unas_nvme_0_percentage_used = 5
   unas/smb/clients             → unas_smb_connections_attributes = [{...}]
@@ -47,6 +52,19 @@ Examples:
 
 REFRESH_DEBOUNCE_SECONDS = 0.5
 MACHINE_ID_WINDOW_SECONDS = 120
+STALE_DATA_SECONDS = 120
+STALE_CLEANUP_INTERVAL_SECONDS = 60
+
+
+def _parse_number(payload: str) -> str | int | float:
+    # checks the shape first so non-numeric payloads don't pay for a raised ValueError
+    body = payload[1:] if payload[0] == "-" else payload
+    if body.isdecimal():
+        return int(payload)
+    whole, dot, frac = body.partition(".")
+    if dot and (whole or frac) and (not whole or whole.isdecimal()) and (not frac or frac.isdecimal()):
+        return float(payload)
+    return payload
 
 
 class UNASMQTTClient:
@@ -54,14 +72,20 @@ class UNASMQTTClient:
         self.hass = hass
         self.entry_id = entry_id
         self.mqtt_root = get_mqtt_root(entry_id)
-        self._data: dict[str, Any] = {}
-        self._data_timestamps: dict[str, datetime] = {}
+        self._prefix_len = len(self.mqtt_root) + 1
+        # telemetry expires when it stops arriving, control settings are kept
+        self._telemetry: dict[str, Any] = {}
+        self._config: dict[str, Any] = {}
+        # timestamps are event loop time (monotonic seconds)
+        self._telemetry_timestamps: dict[str, float] = {}
         self._subscriptions: list = []
         self._status: str = "unknown"
-        self._last_update: datetime | None = None
+        self._last_update: float | None = None
         self._pending_refresh: asyncio.TimerHandle | None = None
+        self._cleanup_handle: asyncio.TimerHandle | None = None
         self._coordinator = None
-        self._recent_machine_ids: dict[str, datetime] = {}
+        self._recent_machine_ids: dict[str, float] = {}
+        self._listeners: dict[str, list[Callable[[str], None]]] = {}
 
     async def async_subscribe(self) -> None:
         if mqtt.DOMAIN not in self.hass.data:
@@ -72,6 +96,7 @@ class UNASMQTTClient:
             sub = await mqtt.async_subscribe(self.hass, f"{self.mqtt_root}/#", self._handle_message, qos=0)
             self._subscriptions.append(sub)
             _LOGGER.debug("Subscribed to MQTT topic: %s/#", self.mqtt_root)
+            self._schedule_cleanup()
         except Exception as err:
             _LOGGER.error("Failed to subscribe to %s/#: %s", self.mqtt_root, err)
 
@@ -80,136 +105,191 @@ class UNASMQTTClient:
         self._pending_refresh = None
         if pending:
             pending.cancel()
+        if self._cleanup_handle:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
         count = len(self._subscriptions)
         for unsub in self._subscriptions:
             unsub()
         self._subscriptions.clear()
         _LOGGER.debug("Unsubscribed from %d MQTT topics", count)
 
-    def _schedule_refresh(self) -> None:
-        pending = self._pending_refresh
-        if pending:
-            pending.cancel()
+    def add_listener(self, key: str, listener: Callable[[str], None]) -> Callable[[], None]:
+        # fans out payloads from the shared wildcard subscription instead of
+        # each entity subscribing to its topic again
+        listeners = self._listeners.setdefault(key, [])
+        listeners.append(listener)
 
-        def do_refresh():
-            self._pending_refresh = None
-            coordinator = self._coordinator
-            if coordinator is not None:
-                self.hass.async_create_task(coordinator.async_request_refresh())
+        def remove_listener() -> None:
+            if listener in listeners:
+                listeners.remove(listener)
 
-        self._pending_refresh = self.hass.loop.call_later(REFRESH_DEBOUNCE_SECONDS, do_refresh)
+        return remove_listener
 
-    @callback
-    def _handle_message(self, msg) -> None:
-        topic = msg.topic
-        if not topic.startswith(self.mqtt_root):
-            return
-        
-        parts = topic[len(self.mqtt_root):].lstrip("/").split("/")
-        if not parts:
-            return
-        
-        num_parts = len(parts)
-        
-        if num_parts == 1:
-            self._handle_one_part(parts, msg.payload)
-        elif num_parts == 2:
-            self._handle_two_part(parts, msg.payload)
-        elif num_parts == 3:
-            self._handle_three_part(parts, msg.payload)
-        elif num_parts == 4:
-            self._handle_four_part(parts, msg.payload)
-
-    def _handle_one_part(self, parts, payload):
-        if parts[0] == "availability":
-            self._status = payload
-            _LOGGER.debug("UNAS status: %s", self._status)
-            if payload == "online":
-                self._last_update = datetime.now()
-            self._schedule_refresh()
+    def get_value(self, key: str) -> Any:
+        if key in self._config:
+            return self._config[key]
+        return self._telemetry.get(key)
 
-    def _handle_two_part(self, parts, payload):
-        category, item = parts[0], parts[1]
-        
-        # unas/system/<metric>
-        if category == "system":
-            self._store_value(f"unas_{item}", payload)
-            if item == "machine_id" and payload:
-                self._recent_machine_ids[payload] = datetime.now()
-        
-        # unas/smb/connections or unas/smb/clients
-        elif category == "smb":
-            if item == "connections":
-                self._store_value("unas_smb_connections", payload)
-            elif item == "clients":
-                self._store_attributes("unas_smb_connections", payload)
-        
-        # unas/nfs/mounts or unas/nfs/clients
-        elif category == "nfs":
-            if item == "mounts":
-                self._store_value("unas_nfs_mounts", payload)
-            elif item == "clients":
-                self._store_attributes("unas_nfs_mounts", payload)
-        
-        # unas/control/<setting>
-        elif category == "control":
-            self._store_value(item, payload)
-
-    def _handle_three_part(self, parts, payload):
-        category, identifier, metric = parts[0], parts[1], parts[2]
-        
-        # unas/hdd/<bay>/<metric> or unas/nvme/<slot>/<metric>
-        if category in ("hdd", "nvme"):
-            self._store_value(f"unas_{category}_{identifier}_{metric}", payload)
-        
-        # unas/pool/<num>/<metric>
-        elif category == "pool":
-            self._store_value(f"unas_pool{identifier}_{metric}", payload)
-
-        # unas/share/<name>/<metric>
-        elif category == "share":
-            if metric == "members":
-                self._store_attributes(f"unas_share_{identifier}_member_count", payload)
-            else:
-                self._store_value(f"unas_share_{identifier}_{metric}", payload)
+    def _notify_listeners(self, key: str, payload: str) -> None:
+        if listeners := self._listeners.get(key):
+            for listener in tuple(listeners):
+                listener(payload)
+
+    def _schedule_cleanup(self) -> None:
+        self._cleanup_handle = self.hass.loop.call_later(STALE_CLEANUP_INTERVAL_SECONDS, self._periodic_cleanup)
+
+    def _periodic_cleanup(self) -> None:
+        self._cleanup_stale_data()
+        self._schedule_cleanup()
 
-        # unas/control/fan/mode
-        elif category == "control" and identifier == "fan" and metric == "mode":
-            self._store_value("fan_mode", payload)
+    def _schedule_refresh(self) -> None:
+        # one timer per debounce window; messages arriving while it is pending ride along
+        if self._pending_refresh is not None:
+            return
+        self._pending_refresh = self.hass.loop.call_later(REFRESH_DEBOUNCE_SECONDS, self._do_refresh)
+
+    def _do_refresh(self) -> None:
+        self._pending_refresh = None
+        coordinator = self._coordinator
+        if coordinator is not None:
+            self.hass.async_create_task(coordinator.async_request_refresh())
 
-    def _handle_four_part(self, parts, payload):
-        if parts[0:3] == ["control", "fan", "curve"]:
-            param = parts[3]
-            self._store_value(f"fan_curve_{param}", payload)
+    @callback
+    def _handle_message(self, msg) -> None:
+        # only {root}/# is subscribed, so the prefix is always there; the bare root
+        # topic slices to "" and matches no handler
+        parts = msg.topic[self._prefix_len:].split("/")
+        handler = self._HANDLERS.get((len(parts), parts[0]))
+        if handler is None:
+            return
+        if parts[-1] == "state":
+            self._handle_state(handler, parts, msg.payload)
+        else:
+            handler(self, parts, msg.payload)
 
-    def _store_value(self, key: str, payload: str) -> None:
-        if not payload:
+    # unas/<category>/.../state: a JSON object of metrics for that device
+    def _handle_state(self, handler, parts, payload):
+        try:
+            values = json_loads(payload)
+        except JSON_DECODE_EXCEPTIONS:
+            _LOGGER.warning("Failed to parse JSON state for %s", "/".join(parts))
+            return
+        if not isinstance(values, dict):
             return
+        for metric, value in values.items():
+            parts[-1] = metric
+            # json numbers go through as decoded, str() could print them in exponent form
+            if isinstance(value, str) or (isinstance(value, (int, float)) and not isinstance(value, bool)):
+                handler(self, parts, value)
+            else:
+                handler(self, parts, str(value))
+
+    # unas/availability
+    def _handle_availability(self, parts, payload):
+        self._status = payload
+        _LOGGER.debug("UNAS status: %s", self._status)
+        if payload == "online":
+            self._last_update = self.hass.loop.time()
+        self._schedule_refresh()
 
-        value: str | int | float = payload
-        if "." in payload:
-            try:
-                value = float(payload)
-            except ValueError:
-                pass
+    # unas/system/<metric>
+    def _handle_system(self, parts, payload):
+        item = parts[1]
+        self._store_value(f"unas_{item}", payload)
+        if item == "machine_id" and payload:
+            self._recent_machine_ids[payload] = self.hass.loop.time()
+
+    # unas/smb/connections or unas/smb/clients
+    def _handle_smb(self, parts, payload):
+        item = parts[1]
+        if item == "connections":
+            self._store_value("unas_smb_connections", payload)
+        elif item == "clients":
+            self._store_attributes("unas_smb_connections", payload)
+
+    # unas/nfs/mounts or unas/nfs/clients
+    def _handle_nfs(self, parts, payload):
+        item = parts[1]
+        if item == "mounts":
+            self._store_value("unas_nfs_mounts", payload)
+        elif item == "clients":
+            self._store_attributes("unas_nfs_mounts", payload)
+
+    # unas/control/<setting>
+    def _handle_control(self, parts, payload):
+        self._store_value(parts[1], payload, config=True)
+
+    # unas/hdd/<bay>/<metric> or unas/nvme/<slot>/<metric>
+    def _handle_disk(self, parts, payload):
+        category, identifier, metric = parts
+        self._store_value(f"unas_{category}_{identifier}_{metric}", payload)
+
+    # unas/pool/<num>/<metric>
+    def _handle_pool(self, parts, payload):
+        self._store_value(f"unas_pool{parts[1]}_{parts[2]}", payload)
+
+    # unas/share/<name>/<metric>
+    def _handle_share(self, parts, payload):
+        identifier, metric = parts[1], parts[2]
+        if metric == "members":
+            self._store_attributes(f"unas_share_{identifier}_member_count", payload)
         else:
-            try:
-                value = int(payload)
-            except ValueError:
-                pass
-
-        self._data[key] = value
-        self._data_timestamps[key] = datetime.now()
-        self._last_update = datetime.now()
+            self._store_value(f"unas_share_{identifier}_{metric}", payload)
+
+    # unas/control/fan/mode
+    def _handle_fan_mode(self, parts, payload):
+        if parts[1] == "fan" and parts[2] == "mode":
+            self._store_value("fan_mode", payload, config=True)
+
+    # unas/control/fan/curve/<param>
+    def _handle_fan_curve(self, parts, payload):
+        if parts[1] == "fan" and parts[2] == "curve":
+            self._store_value(f"fan_curve_{parts[3]}", payload, config=True)
+
+    # (number of topic parts below the root, first part) -> handler
+    _HANDLERS = {
+        (1, "availability"): _handle_availability,
+        (2, "system"): _handle_system,
+        (2, "smb"): _handle_smb,
+        (2, "nfs"): _handle_nfs,
+        (2, "control"): _handle_control,
+        (3, "hdd"): _handle_disk,
+        (3, "nvme"): _handle_disk,
+        (3, "pool"): _handle_pool,
+        (3, "share"): _handle_share,
+        (3, "control"): _handle_fan_mode,
+        (4, "control"): _handle_fan_curve,
+    }
+
+    def _store_value(self, key: str, payload: str | int | float, config: bool = False) -> None:
+        if isinstance(payload, str):
+            if not payload:
+                return
+            value = _parse_number(payload)
+        else:
+            value = payload
+            payload = str(payload)
+        now = self.hass.loop.time()
+        if config:
+            self._config[key] = value
+        else:
+            if key not in self._telemetry and self._coordinator is not None:
+                self._coordinator.new_data_event.set()
+            self._telemetry[key] = value
+            self._telemetry_timestamps[key] = now
+        self._last_update = now
+        self._notify_listeners(key, payload)
         self._schedule_refresh()
 
     def _store_attributes(self, key: str, payload: str) -> None:
         try:
-            self._data[f"{key}_attributes"] = json.loads(payload)
-            self._data_timestamps[f"{key}_attributes"] = datetime.now()
-            self._last_update = datetime.now()
+            now = self.hass.loop.time()
+            self._telemetry[f"{key}_attributes"] = json_loads(payload)
+            self._telemetry_timestamps[f"{key}_attributes"] = now
+            self._last_update = now
             self._schedule_refresh()
-        except json.JSONDecodeError:
+        except JSON_DECODE_EXCEPTIONS:
             _LOGGER.warning("Failed to parse JSON attributes for %s", key)
 
     def is_available(self) -> bool:
@@ -218,34 +298,24 @@ class UNASMQTTClient:
         if self._last_update is None:
             return False
 
-        time_since_update = (datetime.now() - self._last_update).total_seconds()
-        if time_since_update <= 120:
-            return True
-
-        return False
+        return self.hass.loop.time() - self._last_update <= STALE_DATA_SECONDS
 
     def get_data(self) -> dict[str, Any]:
-        self._cleanup_stale_data()
-        return self._data.copy()
+        # stale keys are dropped by the periodic cleanup, not on every read
+        return {**self._config, **self._telemetry}
 
     def get_recent_machine_ids(self) -> set[str]:
-        cutoff = datetime.now() - timedelta(seconds=MACHINE_ID_WINDOW_SECONDS)
+        cutoff = self.hass.loop.time() - MACHINE_ID_WINDOW_SECONDS
         self._recent_machine_ids = {
             mid: ts for mid, ts in self._recent_machine_ids.items() if ts > cutoff
         }
         return set(self._recent_machine_ids.keys())
 
     def _cleanup_stale_data(self) -> None:
-        now = datetime.now()
-        stale_keys = []
-        
-        for key, timestamp in self._data_timestamps.items():
-            if key.startswith(("fan_curve_", "fan_mode", "monitor_interval")):
-                continue
-            
-            if (now - timestamp).total_seconds() > 120:
-                stale_keys.append(key)
-        
+        now = self.hass.loop.time()
+        stale_keys = [
+            key for key, timestamp in self._telemetry_timestamps.items() if now - timestamp > STALE_DATA_SECONDS
+        ]
         for key in stale_keys:
-            del self._data[key]
-            del self._data_timestamps[key]
+            del self._telemetry[key]
+            del self._telemetry_timestamps[key]
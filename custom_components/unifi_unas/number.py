@@ -1,31 +1,76 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+from datetime import datetime
+from typing import NamedTuple
 
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers.device_registry import DeviceInfo
 
 from homeassistant.components import mqtt
 
 from . import UNASDataUpdateCoordinator
-from .const import DOMAIN, get_device_info, get_mqtt_topics
+from .const import DOMAIN
 from .fan_mode import FanModeMixin
 
 _LOGGER = logging.getLogger(__name__)
 
-# fan curve parameter definitions: (key, name, min, max, default, unit, icon)
-FAN_CURVE_PARAMS = [
-    ("min_temp", "Min Temperature", 20, 50, 40, "°C", "mdi:thermometer-low"),
-    ("max_temp", "Max Temperature", 30, 60, 50, "°C", "mdi:thermometer-high"),
-    ("min_fan", "Min Fan Speed", 0, 100, 30, "%", "mdi:fan-speed-1"),
-    ("max_fan", "Max Fan Speed", 1, 100, 100, "%", "mdi:fan-speed-3"),
-    ("target_temp", "Target Temperature", 20, 50, 40, "°C", "mdi:thermometer-check"),
-]
+# how long to wait for retained fan curve values before publishing defaults
+FAN_CURVE_DEFAULT_DELAY = 2.0
+
+
+class FanCurveParam(NamedTuple):
+    key: str
+    name: str
+    min_val: int
+    max_val: int
+    default: int
+    unit: str
+    icon: str
+
+
+FAN_CURVE_PARAMS = (
+    FanCurveParam("min_temp", "Min Temperature", 20, 50, 40, "°C", "mdi:thermometer-low"),
+    FanCurveParam("max_temp", "Max Temperature", 30, 60, 50, "°C", "mdi:thermometer-high"),
+    FanCurveParam("min_fan", "Min Fan Speed", 0, 100, 30, "%", "mdi:fan-speed-1"),
+    FanCurveParam("max_fan", "Max Fan Speed", 1, 100, 100, "%", "mdi:fan-speed-3"),
+    FanCurveParam("target_temp", "Target Temperature", 20, 50, 40, "°C", "mdi:thermometer-check"),
+)
+
+# fan modes each curve parameter applies to ("auto" is the custom curve)
+_CUSTOM_CURVE = frozenset({"auto"})
+_TARGET_TEMP = frozenset({"target_temp"})
+_CURVE_OR_TARGET = _CUSTOM_CURVE | _TARGET_TEMP
+FAN_CURVE_PARAM_MODES = {
+    "min_temp": _CUSTOM_CURVE,
+    "max_temp": _CUSTOM_CURVE,
+    "target_temp": _TARGET_TEMP,
+    "min_fan": _CURVE_OR_TARGET,
+    "max_fan": _CURVE_OR_TARGET,
+}
+# curve parameters published as pwm rather than percent
+FAN_PWM_PARAMS = frozenset({"min_fan", "max_fan"})
+
+# percent <-> pwm conversions, precomputed over the whole input range
+PCT_TO_PWM = tuple(round((pct * 255) / 100) for pct in range(101))
+PWM_TO_PCT = tuple(round((pwm * 100) / 255) for pwm in range(256))
+# encoded payloads for every value we publish (pwm 0-255 covers the temperatures too)
+_INT_STR_BYTES = tuple(str(i).encode() for i in range(256))
+
+
+def _pct_to_pwm(pct: float) -> int:
+    return PCT_TO_PWM[min(max(int(pct), 0), 100)]
+
+
+def _pwm_to_pct(pwm: float) -> int:
+    return PWM_TO_PCT[min(max(int(pwm), 0), 255)]
 
 
 async def async_setup_entry(
@@ -37,28 +82,42 @@ async def async_setup_entry(
         "coordinator"
     ]
 
-    entities = [
-        UNASFanSpeedNumber(coordinator, hass),
+    # add fan curve configuration entities
+    curve_entities = [
+        UNASFanCurveNumber(coordinator, hass, param) for param in FAN_CURVE_PARAMS
     ]
 
-    # add fan curve configuration entities
-    for key, name, min_val, max_val, default, unit, icon in FAN_CURVE_PARAMS:
-        entities.append(
-            UNASFanCurveNumber(
-                coordinator, hass, key, name, min_val, max_val, default, unit, icon
-            )
-        )
+    async_add_entities([UNASFanSpeedNumber(coordinator, hass), *curve_entities])
 
-    async_add_entities(entities)
+    # cancelled if the entry unloads before it fires
+    entry.async_on_unload(
+        async_call_later(hass, FAN_CURVE_DEFAULT_DELAY, functools.partial(_publish_curve_defaults, curve_entities))
+    )
+
+
+async def _publish_curve_defaults(entities: list[UNASFanCurveNumber], _now: datetime) -> None:
+    # entities disabled in the registry are never added: hass is reset to None and
+    # their retained value on the broker must be left alone
+    pending = [
+        entity
+        for entity in entities
+        if entity.hass is not None and entity.entity_id and entity.native_value is None
+    ]
+    for entity in pending:
+        entity._attr_native_value = int(entity._default)
+        entity.async_write_ha_state()
+    await asyncio.gather(*(entity._publish_to_mqtt(entity._default) for entity in pending))
 
 
 class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreEntity):
+    __slots__ = ("_mode_topic", "_current_value", "_unsubscribe_speed")
+
     def __init__(
         self, coordinator: UNASDataUpdateCoordinator, hass: HomeAssistant
     ) -> None:
         super().__init__(coordinator)
         self.hass = hass
-        self._topics = get_mqtt_topics(coordinator.entry.entry_id)
+        self._mode_topic = coordinator.topics["fan_mode"]
         self._attr_has_entity_name = True
         self._attr_name = "Fan Speed"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_fan_speed_control"
@@ -71,13 +130,7 @@ class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
         self._current_value = None
         self._unsubscribe_speed = None
 
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -88,21 +141,26 @@ class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
             except (ValueError, TypeError):
                 pass
 
-        @callback
-        def speed_message_received(msg):
-            try:
-                pwm_value = int(msg.payload)
-                percentage = round((pwm_value * 100) / 255)
-                self._current_value = percentage
-                self.async_write_ha_state()
-            except (ValueError, TypeError) as err:
-                _LOGGER.error("Failed to parse fan speed: %s", err)
+        # fan speed arrives in the system state and from fan_control.sh on its own topic,
+        # both end up under the same key in the mqtt client
+        mqtt_client = self.coordinator.mqtt_client
+        if isinstance(speed := mqtt_client.get_value("unas_fan_speed"), int):
+            self._current_value = _pwm_to_pct(speed)
+        self._unsubscribe_speed = mqtt_client.add_listener("unas_fan_speed", self._handle_speed_message)
 
-        self._unsubscribe_speed = await mqtt.async_subscribe(
-            self.hass, f"{self._topics['system']}/fan_speed", speed_message_received, qos=0
-        )
+        self._subscribe_fan_mode()
 
-        await self._subscribe_fan_mode()
+    @callback
+    def _handle_speed_message(self, payload: str) -> None:
+        try:
+            pwm_value = int(payload)
+            percentage = _pwm_to_pct(pwm_value)
+            if percentage == self._current_value:
+                return
+            self._current_value = percentage
+            self._schedule_write()
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Failed to parse fan speed: %s", err)
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsubscribe_speed:
@@ -120,9 +178,7 @@ class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
 
     @property
     def available(self) -> bool:
-        mqtt_available = self.coordinator.mqtt_client.is_available()
-        service_running = self.coordinator.data.get("fan_control_running", False)
-        return mqtt_available and service_running
+        return self.coordinator.fan_control_available
 
     @property
     def icon(self) -> str:
@@ -141,11 +197,11 @@ class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
             _LOGGER.warning("Cannot set fan speed - not in Set Speed mode")
             return
 
-        pwm_value = round((value * 255) / 100)
+        pwm_value = _pct_to_pwm(value)
 
         try:
             await mqtt.async_publish(
-                self.hass, f"{self._topics['control']}/fan/mode", str(pwm_value), qos=0, retain=True
+                self.hass, self._mode_topic, _INT_STR_BYTES[pwm_value], qos=0, retain=True
             )
         except Exception as err:
             _LOGGER.error("Failed to publish fan speed: %s", err)
@@ -156,45 +212,39 @@ class UNASFanSpeedNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
 
 
 class UNASFanCurveNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreEntity):
+    __slots__ = ("_key", "_default", "_unsubscribe", "_is_fan_param", "_modes", "_mqtt_topic", "_data_key")
+
+    _mode_attribute = True
+
     def __init__(
         self,
         coordinator: UNASDataUpdateCoordinator,
         hass: HomeAssistant,
-        key: str,
-        name: str,
-        min_val: float,
-        max_val: float,
-        default: float,
-        unit: str,
-        icon: str,
+        param: FanCurveParam,
     ) -> None:
         super().__init__(coordinator)
+        key = param.key
         self.hass = hass
         self._key = key
-        self._topics = get_mqtt_topics(coordinator.entry.entry_id)
         self._attr_has_entity_name = True
-        self._attr_name = name
+        self._attr_name = param.name
         self._attr_unique_id = f"{coordinator.entry.entry_id}_fan_curve_{key}"
-        self._attr_native_min_value = min_val
-        self._attr_native_max_value = max_val
+        self._attr_native_min_value = param.min_val
+        self._attr_native_max_value = param.max_val
         self._attr_native_step = 1
         self._attr_native_value = None
-        self._attr_native_unit_of_measurement = unit
-        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = param.unit
+        self._attr_icon = param.icon
         self._attr_mode = NumberMode.BOX
-        self._default = default
+        self._default = param.default
         self._unsubscribe = None
-        self._is_fan_param = key in ["min_fan", "max_fan"]
+        self._is_fan_param = key in FAN_PWM_PARAMS
+        self._modes = FAN_CURVE_PARAM_MODES.get(key)
 
-        self._mqtt_topic = f"{self._topics['control']}/fan/curve/{key}"
+        self._mqtt_topic = f"{coordinator.topics['fan_curve']}/{key}"
+        self._data_key = f"fan_curve_{key}"
 
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -204,42 +254,35 @@ class UNASFanCurveNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
                 self._attr_native_value = int(float(last_state.state))
             except (ValueError, TypeError):
                 pass
-            self._current_mode = last_state.attributes.get("current_mode")
+            self._set_current_mode(last_state.attributes.get("current_mode"))
 
-        @callback
-        def message_received(msg):
-            try:
-                value = int(float(msg.payload))
-                
-                if self._is_fan_param:
-                    value = round((value * 100) / 255)
-
-                if self._attr_native_min_value <= value <= self._attr_native_max_value:
-                    self._attr_native_value = value
-                    self.async_write_ha_state()
-            except (ValueError, TypeError):
-                pass
-
-        self._unsubscribe = await mqtt.async_subscribe(
-            self.hass, self._mqtt_topic, message_received, qos=0
-        )
+        mqtt_client = self.coordinator.mqtt_client
+        if (value := mqtt_client.get_value(self._data_key)) is not None:
+            self._apply_curve_value(str(value))
+        self._unsubscribe = mqtt_client.add_listener(self._data_key, self._handle_curve_message)
 
-        await self._subscribe_fan_mode()
+        self._subscribe_fan_mode()
 
-        self.hass.loop.call_later(2.0, self._maybe_init_default)
+    def _apply_curve_value(self, payload: str) -> bool:
+        try:
+            value = int(float(payload))
+        except (ValueError, TypeError):
+            return False
 
-    def _maybe_init_default(self) -> None:
-        if self._attr_native_value is None:
-            self._attr_native_value = int(self._default)
+        if self._is_fan_param:
+            value = _pwm_to_pct(value)
 
-            async def publish_default():
-                try:
-                    await self._publish_to_mqtt(self._default)
-                except Exception as err:
-                    _LOGGER.warning("Failed to publish default value for %s: %s", self._key, err)
+        if value == self._attr_native_value:
+            return False
+        if self._attr_native_min_value <= value <= self._attr_native_max_value:
+            self._attr_native_value = value
+            return True
+        return False
 
-            self.hass.async_create_task(publish_default())
-            self.async_write_ha_state()
+    @callback
+    def _handle_curve_message(self, payload: str) -> None:
+        if self._apply_curve_value(payload):
+            self._schedule_write()
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsubscribe:
@@ -249,35 +292,15 @@ class UNASFanCurveNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
 
     @property
     def available(self) -> bool:
-        mqtt_available = self.coordinator.mqtt_client.is_available()
-        service_running = self.coordinator.data.get("fan_control_running", False)
-        has_value = self._attr_native_value is not None
-
-        if not (mqtt_available and service_running and has_value):
+        if not self.coordinator.fan_control_available or self._attr_native_value is None:
             return False
 
-        # Mode-specific availability
-        if self._key in ["min_temp", "max_temp"]:
-            # Only available in Custom Curve mode
-            return self._current_mode == "auto"
-        elif self._key == "target_temp":
-            # Only available in Target Temp mode
-            return self._current_mode == "target_temp"
-        elif self._key in ["min_fan", "max_fan"]:
-            # Available in both Custom Curve and Target Temp modes
-            return self._current_mode in ["auto", "target_temp"]
-
-        return True
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        attrs = {}
-        if self._current_mode is not None:
-            attrs["current_mode"] = self._current_mode
-        return attrs
+        return self._modes is None or self._current_mode in self._modes
 
     async def async_set_native_value(self, value: float) -> None:
         value = int(value)
+        if value == self._attr_native_value:
+            return
 
         mqtt_data = self.coordinator.mqtt_client.get_data()
 
@@ -286,8 +309,8 @@ class UNASFanCurveNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
         min_fan_pwm = mqtt_data.get("fan_curve_min_fan", 204)
         max_fan_pwm = mqtt_data.get("fan_curve_max_fan", 255)
 
-        min_fan = round((min_fan_pwm * 100) / 255) if isinstance(min_fan_pwm, (int, float)) else 80
-        max_fan = round((max_fan_pwm * 100) / 255) if isinstance(max_fan_pwm, (int, float)) else 100
+        min_fan = _pwm_to_pct(min_fan_pwm) if isinstance(min_fan_pwm, (int, float)) else 80
+        max_fan = _pwm_to_pct(max_fan_pwm) if isinstance(max_fan_pwm, (int, float)) else 100
 
         if self._key == "min_temp":
             min_temp = value
@@ -314,11 +337,11 @@ class UNASFanCurveNumber(FanModeMixin, CoordinatorEntity, NumberEntity, RestoreE
     async def _publish_to_mqtt(self, value: float) -> None:
         mqtt_value = value
         if self._is_fan_param:
-            mqtt_value = round((value * 255) / 100)
+            mqtt_value = _pct_to_pwm(value)
 
         try:
             await mqtt.async_publish(
-                self.hass, self._mqtt_topic, str(int(mqtt_value)), qos=0, retain=True
+                self.hass, self._mqtt_topic, _INT_STR_BYTES[int(mqtt_value)], qos=0, retain=True
             )
         except Exception as err:
             _LOGGER.error("Failed to publish fan curve %s: %s", self._key, err)
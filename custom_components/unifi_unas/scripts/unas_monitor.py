@@ -4,12 +4,19 @@ import time
 import subprocess
 import logging
 import json
-import fcntl
 import http.client
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import paho.mqtt.client as mqtt  # type: ignore  # installed on UNAS, not HA
 
+try:
+    # faster smartctl parsing when available; orjson.JSONDecodeError subclasses json's
+    from orjson import loads as json_loads  # type: ignore
+except ImportError:
+    json_loads = json.loads
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(message)s',
@@ -25,6 +32,8 @@ MQTT_PORT = "REPLACE_ME"
 MQTT_TLS = "REPLACE_ME"
 MQTT_TLS_INSECURE = "REPLACE_ME"
 DEFAULT_MONITOR_INTERVAL = 30
+# nvme, pools, smb/nfs and shares only refresh every Nth cycle
+DEFAULT_SLOW_CYCLE_EVERY = 4
 MQTT_AVAILABILITY = f"{MQTT_ROOT}/availability"
 MQTT_SYSTEM = f"{MQTT_ROOT}/system"
 MQTT_HDD = f"{MQTT_ROOT}/hdd"
@@ -35,8 +44,17 @@ MQTT_NFS = f"{MQTT_ROOT}/nfs"
 MQTT_SHARE = f"{MQTT_ROOT}/share"
 MQTT_CONTROL = f"{MQTT_ROOT}/control"
 MONITOR_INTERVAL_TOPIC = f"{MQTT_CONTROL}/monitor_interval"
+SLOW_CYCLE_TOPIC = f"{MQTT_CONTROL}/slow_cycle_every"
 SHARED_TEMP_FILE = "/tmp/unas_hdd_temp"
 MONITOR_INTERVAL_FILE = "/tmp/unas_monitor_interval"
+# caches carried over a restart so the first cycle doesn't start cold
+STATE_FILE = "/tmp/unas_monitor_state.json"
+CPU_TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp"
+FAN_PWM_PATH = "/sys/class/hwmon/hwmon0/pwm1"
+# package versions only change on upgrade, no need to query dpkg every cycle
+PACKAGE_VERSION_TTL = 3600
+# unchanged values are still republished this often; HA drops telemetry it hasn't seen for 120s
+REPUBLISH_INTERVAL = 50
 
 DEVICE_MODEL = "UNAS_PRO"
 
@@ -99,8 +117,69 @@ BAY_MAPPINGS = {
 ATA_TO_BAY = BAY_MAPPINGS.get(DEVICE_MODEL)
 
 
+def meminfo_kb(buf, key):
+    # pulls a single field out of /proc/meminfo without splitting every line
+    start = buf.find(key)
+    if start < 0:
+        return 0
+    start += len(key)
+    return int(buf[start:buf.index(b'kB', start)])
+
+
+def open_sysfs(path):
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def read_sysfs_int(fd):
+    # sysfs attributes are regenerated on every read from offset 0, so one open fd can be reused
+    if fd is None:
+        raise OSError("not available")
+    return int(os.pread(fd, 32, 0))
+
+
+def read_proc_stat():
+    with open('/proc/stat') as f:
+        parts = f.readline().split()
+        values = list(map(int, parts[1:]))
+    idle_time = values[3] + values[4]  # idle + iowait
+    total_time = sum(values)
+    return idle_time, total_time
+
+
+# sectors read (field 6) and written (field 10) for whole sd? disks only, partitions don't match
+DISKSTATS_SD_RE = re.compile(
+    rb'^\s*\d+\s+\d+\s+sd[a-z]\s+\d+\s+\d+\s+(\d+)\s+\d+\s+\d+\s+\d+\s+(\d+)', re.MULTILINE
+)
+
+# data rows only; header and separator lines never start with a pid
+# smbstatus -b: pid, username, group, machine, protocol, version, ...
+SMB_CONNECTION_RE = re.compile(r'^(\d+)\s+(\S+)\s+\S+\s+(\S+)\s+\S+\s+\S+', re.MULTILINE)
+# smbstatus -S: service, pid, machine, ...
+SMB_SHARE_RE = re.compile(r'^(\S+)\s+(\d+)\s+(\S+)', re.MULTILINE)
+# showmount -a: client:path, the "All mount points on host:" header has spaces before its colon
+NFS_MOUNT_RE = re.compile(r'^([^:\s]+):([^:\n]*)$', re.MULTILINE)
+
+
+def read_diskstats():
+    read_sectors = 0
+    write_sectors = 0
+    with open('/proc/diskstats', 'rb') as f:
+        for read, write in DISKSTATS_SD_RE.findall(f.read()):
+            read_sectors += int(read)
+            write_sectors += int(write)
+    return read_sectors, write_sectors
+
+
 class UNASMonitor:
     def __init__(self):
+        # seed the cpu/disk counters first so the startup time counts towards the first sample
+        self.prev_cpu_idle, self.prev_cpu_total = read_proc_stat()
+        self.prev_disk_read, self.prev_disk_write = read_diskstats()
+        self.prev_time = time.time()
+
         self.mqtt = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
         self.mqtt.username_pw_set(MQTT_USER, MQTT_PASS)
         if MQTT_TLS == "true":
@@ -113,23 +192,11 @@ class UNASMonitor:
         self.mqtt.on_connect = self._on_connect
         self.mqtt.on_disconnect = self._on_disconnect
         self.mqtt.on_message = self._on_message
-        self._connected = False
         self.monitor_interval = DEFAULT_MONITOR_INTERVAL
-
-        self.mqtt.will_set(MQTT_AVAILABILITY, "offline", retain=True)
-        self.mqtt.loop_start()
-        try:
-            self.mqtt.connect(MQTT_HOST, int(MQTT_PORT), 60)
-        except Exception as e:
-            logger.warning(f"Initial MQTT connect failed (will retry): {e}")
-
-        for _ in range(30):
-            if self._connected:
-                break
-            time.sleep(1)
-
-        if not self._connected:
-            logger.warning("MQTT not connected after 30s - will keep retrying in background")
+        self.slow_cycle_every = DEFAULT_SLOW_CYCLE_EVERY
+        self._cycle = 0
+        self._slow_pub = []
+        self._nvme_temps = []
 
         self._admin_uid = None
         self._api_warned = False
@@ -138,11 +205,19 @@ class UNASMonitor:
         self.previous_drive_map = {}  # serial -> bay
         self.drive_removed_at = {}  # serial -> (timestamp, bay)
         self.grace_period = 60
-        self.prev_cpu_idle = None
-        self.prev_cpu_total = None
-        self.prev_disk_read = None
-        self.prev_disk_write = None
-        self.prev_time = None
+        self._pending_pub = []
+        self._last_sent = {}  # topic -> (payload, monotonic time sent)
+        self._state_topics = set()
+        self._package_version = ""
+        self._package_version_at = None
+        self._saved_state = None
+        self.load_state()
+        # smartctl spends most of its time waiting on the drive, so query drives in parallel
+        self._smart_pool = ThreadPoolExecutor(max_workers=8)
+        # collectors are independent and mostly wait on subprocesses or the drive API
+        self._collect_pool = ThreadPoolExecutor(max_workers=8)
+        self._cpu_temp_fd = open_sysfs(CPU_TEMP_PATH)
+        self._fan_pwm_fd = open_sysfs(FAN_PWM_PATH)
 
         try:
             with open('/etc/machine-id') as f:
@@ -150,15 +225,29 @@ class UNASMonitor:
         except OSError:
             self.machine_id = ""
 
+        # no waiting for the connection: collection starts right away, and on_connect
+        # clears the publish cache so the first cycle after connecting sends everything
+        self.mqtt.will_set(MQTT_AVAILABILITY, "offline", retain=True)
+        self.mqtt.loop_start()
+        try:
+            self.mqtt.connect(MQTT_HOST, int(MQTT_PORT), 60)
+        except Exception as e:
+            logger.warning(f"Initial MQTT connect failed (will retry): {e}")
+
+    def __del__(self):
+        for fd in (getattr(self, '_cpu_temp_fd', None), getattr(self, '_fan_pwm_fd', None)):
+            if fd is not None:
+                os.close(fd)
+
     def _on_connect(self, _client, _userdata, _flags, reason_code, _properties):
         if reason_code == 0:
             logger.info("MQTT connected")
-            self._connected = True
-            self.mqtt.subscribe(MONITOR_INTERVAL_TOPIC)
+            # broker may have lost retained values, send everything again
+            self._last_sent = {}
+            self.mqtt.subscribe([(MONITOR_INTERVAL_TOPIC, 0), (SLOW_CYCLE_TOPIC, 0)])
             self.mqtt.publish(MQTT_AVAILABILITY, "online", retain=True)
         else:
             logger.error(f"MQTT failed: {reason_code}")
-            self._connected = False
 
     def _on_disconnect(self, _client, _userdata, _flags, reason_code, _properties):
         if reason_code != 0:
@@ -180,21 +269,42 @@ class UNASMonitor:
                         pass
             except (ValueError, TypeError):
                 pass
+        elif msg.topic == SLOW_CYCLE_TOPIC:
+            try:
+                new_every = int(float(msg.payload.decode()))
+                if 1 <= new_every <= 10:
+                    logger.info(f"Slow cycle: every {self.slow_cycle_every} -> {new_every} cycles")
+                    self.slow_cycle_every = new_every
+            except (ValueError, TypeError):
+                pass
 
-    def publish_system(self, metric, value):
-        self.mqtt.publish(f"{MQTT_SYSTEM}/{metric}", str(value), retain=True)
-    
-    def publish_hdd(self, bay, metric, value):
-        self.mqtt.publish(f"{MQTT_HDD}/{bay}/{metric}", str(value), retain=True)
-    
-    def publish_nvme(self, slot, metric, value):
-        self.mqtt.publish(f"{MQTT_NVME}/{slot}/{metric}", str(value), retain=True)
-    
-    def publish_pool(self, pool_num, metric, value):
-        self.mqtt.publish(f"{MQTT_POOL}/{pool_num}/{metric}", str(value), retain=True)
+    # publishes are queued while collecting and sent back to back at the end of the cycle
+    def queue_publish(self, topic, payload):
+        self._pending_pub.append((topic, payload))
+
+    def flush_publishes(self):
+        pending, self._pending_pub = self._pending_pub, []
+        publish = self.mqtt.publish
+        last_sent = self._last_sent
+        now = time.monotonic()
+        for topic, payload in pending:
+            last = last_sent.get(topic)
+            if last is not None and last[0] == payload and now - last[1] < REPUBLISH_INTERVAL:
+                continue
+            last_sent[topic] = (payload, now)
+            publish(topic, payload, retain=True)
+
+    def publish_state(self, base, values):
+        # one JSON snapshot per device on <base>/state instead of a topic per metric
+        self.queue_publish(f"{base}/state", json.dumps(values))
+        if base not in self._state_topics and self.mqtt.is_connected():
+            # drop retained per-metric topics left by older versions
+            self._state_topics.add(base)
+            for metric in values:
+                self.mqtt.publish(f"{base}/{metric}", "", retain=True)
 
     def publish_share(self, name, metric, value):
-        self.mqtt.publish(f"{MQTT_SHARE}/{name}/{metric}", str(value), retain=True)
+        self.queue_publish(f"{MQTT_SHARE}/{name}/{metric}", str(value))
 
     def _get_admin_user_id(self):
         if self._admin_uid:
@@ -335,14 +445,20 @@ class UNASMonitor:
         except (subprocess.SubprocessError, OSError):
             return ""
 
+    def read_smart(self, devices):
+        # identity, health and attributes cover every field we publish; -a would also read the
+        # error and self-test logs from each drive
+        return self._smart_pool.map(
+            lambda device: self.run_cmd(['smartctl', '-i', '-H', '-A', '-j', f'/dev/{device}']), devices
+        )
+
     def write_hdd_temps(self, temps):
         try:
             temp_str = ' '.join(str(t) for t in sorted(temps, reverse=True))
+            # only this process writes the .tmp file and the rename is atomic, so no lock needed
             with open(f"{SHARED_TEMP_FILE}.tmp", 'w') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 f.write(temp_str)
-                f.flush()
-            Path(f"{SHARED_TEMP_FILE}.tmp").rename(SHARED_TEMP_FILE)
+            os.replace(f"{SHARED_TEMP_FILE}.tmp", SHARED_TEMP_FILE)
         except OSError as e:
             logger.warning(f"Failed to write temp file: {e}")
 
@@ -358,17 +474,17 @@ class UNASMonitor:
         match = re.search(r'\.v(\d+\.\d+\.\d+)\.', version_str)
         data['os_version'] = match.group(1) if match else version_str
         if DEVICE_MODEL.startswith("UNVR"):
-            data['protect_version'] = self.run_cmd(['dpkg-query', '-W', '-f=${Version}', 'unifi-protect']).strip()
+            data['protect_version'] = self.get_package_version('unifi-protect')
         else:
-            data['drive_version'] = self.run_cmd(['dpkg-query', '-W', '-f=${Version}', 'unifi-drive']).strip()
+            data['drive_version'] = self.get_package_version('unifi-drive')
         data['cpu_usage'] = self.get_cpu_usage()
         data['disk_read'], data['disk_write'] = self.get_disk_throughput()
 
-        with open('/proc/meminfo') as f:
-            meminfo = {parts[0].rstrip(':'): int(parts[1]) for line in f if len(parts := line.split()) >= 2}
+        with open('/proc/meminfo', 'rb') as f:
+            meminfo = f.read()
 
-        mem_total = meminfo.get('MemTotal', 0) // 1024
-        mem_avail = meminfo.get('MemAvailable', 0) // 1024
+        mem_total = meminfo_kb(meminfo, b'MemTotal:') // 1024
+        mem_avail = meminfo_kb(meminfo, b'MemAvailable:') // 1024
         mem_used = mem_total - mem_avail
 
         data['memory_total'] = mem_total
@@ -376,48 +492,29 @@ class UNASMonitor:
         data['memory_usage'] = round((mem_used / mem_total) * 100, 1) if mem_total else 0
 
         try:
-            with open('/sys/class/thermal/thermal_zone0/temp') as f:
-                data['cpu_temp'] = int(f.read().strip()) // 1000
+            data['cpu_temp'] = read_sysfs_int(self._cpu_temp_fd) // 1000
         except (OSError, ValueError):
             data['cpu_temp'] = 0
 
         try:
-            with open('/sys/class/hwmon/hwmon0/pwm1') as f:
-                pwm = int(f.read().strip())
-                data['fan_speed'] = pwm
-                data['fan_speed_percent'] = int((pwm * 100) / 255)
+            pwm = read_sysfs_int(self._fan_pwm_fd)
+            data['fan_speed'] = pwm
+            data['fan_speed_percent'] = int((pwm * 100) / 255)
         except (OSError, ValueError):
             data['fan_speed'] = 0
             data['fan_speed_percent'] = 0
 
         return data
 
-    def get_cpu_usage(self):
-        def read_proc_stat():
-            with open('/proc/stat') as f:
-                parts = f.readline().split()
-                values = list(map(int, parts[1:]))
-            idle_time = values[3] + values[4]  # idle + iowait
-            total_time = sum(values)
-            return idle_time, total_time
-
-        # handle script startup/restart to avoid reporting 0% usage to HA
-        if self.prev_cpu_idle is None:
-            idle_start, total_start = read_proc_stat()
-            time.sleep(1.0)
-            idle_end, total_end = read_proc_stat()
-
-            self.prev_cpu_idle = idle_end
-            self.prev_cpu_total = total_end
-
-            delta_idle = idle_end - idle_start
-            delta_total = total_end - total_start
-
-            if delta_total <= 0:
-                return 0
-
-            return int(100 * (1 - delta_idle / delta_total))
+    def get_package_version(self, package):
+        # wall clock, the timestamp is persisted across restarts
+        now = time.time()
+        if self._package_version_at is None or now - self._package_version_at > PACKAGE_VERSION_TTL:
+            self._package_version = self.run_cmd(['dpkg-query', '-W', '-f=${Version}', package]).strip()
+            self._package_version_at = now
+        return self._package_version
 
+    def get_cpu_usage(self):
         idle_now, total_now = read_proc_stat()
         delta_idle = idle_now - self.prev_cpu_idle
         delta_total = total_now - self.prev_cpu_total
@@ -431,41 +528,6 @@ class UNASMonitor:
         return int(100 * (1 - delta_idle / delta_total))
 
     def get_disk_throughput(self):
-        def read_diskstats():
-            read_sectors = 0
-            write_sectors = 0
-            with open('/proc/diskstats') as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) < 10:
-                        continue
-                    device = parts[2]
-                    if device.startswith('sd') and len(device) == 3:
-                        read_sectors += int(parts[5])
-                        write_sectors += int(parts[9])
-            return read_sectors, write_sectors
-
-        # handle script startup/restart to avoid reporting 0mbps usage to HA
-        if self.prev_disk_read is None:
-            read_start, write_start = read_diskstats()
-            time_start = time.time()
-            time.sleep(1.0)
-            read_end, write_end = read_diskstats()
-            time_end = time.time()
-
-            self.prev_disk_read = read_end
-            self.prev_disk_write = write_end
-            self.prev_time = time_end
-
-            time_delta = time_end - time_start
-            read_bytes = (read_end - read_start) * 512
-            write_bytes = (write_end - write_start) * 512
-
-            read_mbps = (read_bytes / time_delta) / (1024 * 1024)
-            write_mbps = (write_bytes / time_delta) / (1024 * 1024)
-
-            return round(read_mbps, 2), round(write_mbps, 2)
-
         read_now, write_now = read_diskstats()
         time_now = time.time()
 
@@ -489,9 +551,13 @@ class UNASMonitor:
         if device in self.bay_cache:
             return self.bay_cache[device]
 
-        output = self.run_cmd(['udevadm', 'info', '-q', 'path', '-n', f'/dev/{device}'])
+        # /sys/block/<dev> links to the same devpath udevadm reports, without forking udevadm
+        try:
+            devpath = os.readlink(f'/sys/block/{device}')
+        except OSError:
+            devpath = ''
         bay = None
-        for part in output.split('/'):
+        for part in devpath.split('/'):
             if part.startswith('ata') and (ata_num := part[3:]) in ATA_TO_BAY:
                 bay = ATA_TO_BAY[ata_num]
                 break
@@ -500,7 +566,11 @@ class UNASMonitor:
         return bay
 
     def get_drives(self):
-        current_drives = {p.name for p in Path('/dev').glob('sd?')}
+        # same match as glob('sd?') without building a Path per /dev entry
+        with os.scandir('/dev') as entries:
+            current_drives = {
+                name for entry in entries if len(name := entry.name) == 3 and name.startswith('sd')
+            }
 
         if current_drives != self.known_drives:
             self.bay_cache.clear()
@@ -510,20 +580,15 @@ class UNASMonitor:
         current_drive_map = {}
         now = time.time()
 
-        for device_path in Path('/dev').glob('sd?'):
-            device = device_path.name
-            bay = self.get_bay_number(device)
-
-            if not bay:
-                continue
+        bays = {device: bay for device in sorted(current_drives) if (bay := self.get_bay_number(device))}
 
-            output = self.run_cmd(['smartctl', '-a', '-j', f'/dev/{device}'])
+        for (device, bay), output in zip(bays.items(), self.read_smart(bays)):
             if not output:
                 logger.debug(f"No smartctl output for /dev/{device}")
                 continue
 
             try:
-                data = json.loads(output)
+                data = json_loads(output)
             except json.JSONDecodeError as e:
                 logger.warning(f"Failed to parse smartctl JSON for /dev/{device}: {e}")
                 continue
@@ -614,17 +679,17 @@ class UNASMonitor:
     def get_nvme_drives(self):
         nvmes = []
 
-        for device_path in sorted(Path('/dev').glob('nvme*n1')):
-            device = device_path.name
+        devices = [device_path.name for device_path in sorted(Path('/dev').glob('nvme*n1'))]
+
+        for device, output in zip(devices, self.read_smart(devices)):
             slot = device.replace('nvme', '').replace('n1', '')
 
-            output = self.run_cmd(['smartctl', '-a', '-j', f'/dev/{device}'])
             if not output:
                 logger.debug(f"No smartctl output for /dev/{device}")
                 continue
 
             try:
-                data = json.loads(output)
+                data = json_loads(output)
             except json.JSONDecodeError as e:
                 logger.warning(f"Failed to parse smartctl JSON for NVMe /dev/{device}: {e}")
                 continue
@@ -666,14 +731,15 @@ class UNASMonitor:
             if not volume_dir.is_dir():
                 continue
 
-            df_output = self.run_cmd(['df', '-B1', str(volume_dir)])
-            lines = df_output.strip().split('\n')
-
-            if len(lines) < 2:
+            try:
+                st = os.statvfs(volume_dir)
+            except OSError:
                 continue
 
-            parts = lines[1].split()
-            size_gb = round(int(parts[1]) / (1000 ** 3))
+            size = st.f_blocks * st.f_frsize
+            used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            available = st.f_bavail * st.f_frsize
+            size_gb = round(size / (1000 ** 3))
 
             if size_gb <= 75:
                 continue
@@ -681,9 +747,10 @@ class UNASMonitor:
             pools.append({
                 'pool': pool_num,
                 'size': size_gb,
-                'used': round(int(parts[2]) / (1000 ** 3)),
-                'available': round(int(parts[3]) / (1000 ** 3)),
-                'usage': int(parts[4].rstrip('%'))
+                'used': round(used / (1000 ** 3)),
+                'available': round(available / (1000 ** 3)),
+                # same as df's Use%: used share of the space non-root users can reach, rounded up
+                'usage': -(-used * 100 // (used + available)) if used + available else 0
             })
             pool_num += 1
 
@@ -691,20 +758,10 @@ class UNASMonitor:
 
     def get_smb_connections(self):
         output = self.run_cmd(['smbstatus', '-b'])
-        lines = output.strip().split('\n')
 
         connections = {}
-        for line in lines[3:]:
-            if not line.strip() or line.startswith('---'):
-                continue
-
-            parts = line.split()
-            if len(parts) < 6:
-                continue
-
-            pid = parts[0]
-            username = parts[1]
-            ip = parts[3].split('(')[1].split(':')[0] if '(' in parts[3] else parts[3]
+        for pid, username, machine in SMB_CONNECTION_RE.findall(output):
+            ip = machine.split('(')[1].split(':')[0] if '(' in machine else machine
 
             connections[pid] = {
                 'username': username,
@@ -715,41 +772,22 @@ class UNASMonitor:
 
     def get_smb_shares(self):
         output = self.run_cmd(['smbstatus', '-S'])
-        lines = output.strip().split('\n')
 
         shares = []
-        for line in lines[2:]:
-            if not line.strip() or line.startswith('---'):
-                continue
-
-            parts = line.split()
-            if len(parts) < 3:
-                continue
-
+        for share, pid, ip in SMB_SHARE_RE.findall(output):
             shares.append({
-                'share': parts[0],
-                'pid': parts[1],
-                'ip': parts[2]
+                'share': share,
+                'pid': pid,
+                'ip': ip
             })
 
         return shares
 
     def get_nfs_mounts(self):
         output = self.run_cmd(['showmount', '-a'])
-        lines = output.strip().split('\n')[1:]
 
         mounts = []
-        for line in lines:
-            if not line.strip():
-                continue
-
-            parts = line.split(':')
-            if len(parts) != 2:
-                continue
-
-            ip = parts[0]
-            path = parts[1]
-
+        for ip, path in NFS_MOUNT_RE.findall(output):
             share_match = path.split('/.srv/.unifi-drive/')
             if len(share_match) == 2:
                 share = share_match[1].split('/')[0]
@@ -763,68 +801,132 @@ class UNASMonitor:
 
         return mounts
 
-    def collect_and_publish(self):
-        system = self.get_system_metrics()
-        for key, value in system.items():
-            self.publish_system(key, value)
-
-        drives = self.get_drives()
-        for drive in drives:
-            bay = drive.pop('bay')
-            for key, value in drive.items():
-                self.publish_hdd(bay, key, value)
-
-        nvmes = self.get_nvme_drives()
-        for nvme in nvmes:
-            slot = nvme.pop('slot')
-            for key, value in nvme.items():
-                self.publish_nvme(slot, key, value)
-
-        pools = self.get_pools_from_api()
-        for pool in pools:
-            pool_num = pool.pop('pool')
-            for key, value in pool.items():
-                self.publish_pool(pool_num, key, value)
+    def load_state(self):
+        try:
+            with open(STATE_FILE) as f:
+                state = json.load(f)
+            self._package_version = state['package_version']
+            self._package_version_at = state['package_version_at']
+            self.previous_drive_map = state['drive_map']
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        logger.info(f"Restored monitor state for {len(self.previous_drive_map)} drives")
+
+    def save_state(self):
+        state = json.dumps({
+            'package_version': self._package_version,
+            'package_version_at': self._package_version_at,
+            'drive_map': self.previous_drive_map,
+        }, sort_keys=True)
+        if state == self._saved_state:
+            return
+        try:
+            with open(f"{STATE_FILE}.tmp", 'w') as f:
+                f.write(state)
+            os.replace(f"{STATE_FILE}.tmp", STATE_FILE)
+            self._saved_state = state
+        except OSError as e:
+            logger.warning(f"Failed to write state file: {e}")
 
+    def collect_and_publish(self):
+        try:
+            self.collect()
+        finally:
+            # whatever was collected before an error still goes out, as it did before queueing
+            self.flush_publishes()
+        self.save_state()
+
+    def collect(self):
+        # drives stay on every cycle, fan control reads their temperatures from SHARED_TEMP_FILE
+        slow = self._cycle % self.slow_cycle_every == 0
+        self._cycle += 1
         # UNVR doesn't have SMB/NFS/shares
-        if not DEVICE_MODEL.startswith("UNVR"):
-            smb_connections = self.get_smb_connections()
-            smb_shares = self.get_smb_shares()
-
-            smb_data = {
-                'count': len(smb_shares),
-                'clients': []
-            }
-
-            for share in smb_shares:
-                conn = smb_connections.get(share['pid'], {})
-                smb_data['clients'].append({
-                    'username': conn.get('username', 'unknown'),
-                    'ip': share['ip'],
-                    'share': share['share']
-                })
-
-            self.mqtt.publish(f"{MQTT_SMB}/connections", str(smb_data['count']), retain=True)
-            self.mqtt.publish(f"{MQTT_SMB}/clients", json.dumps(smb_data['clients']), retain=True)
-
-            nfs_mounts = self.get_nfs_mounts()
-            nfs_data = {
-                'count': len(nfs_mounts),
-                'clients': nfs_mounts
-            }
-
-            self.mqtt.publish(f"{MQTT_NFS}/mounts", str(nfs_data['count']), retain=True)
-            self.mqtt.publish(f"{MQTT_NFS}/clients", json.dumps(nfs_data['clients']), retain=True)
+        has_shares = not DEVICE_MODEL.startswith("UNVR")
+
+        submit = self._collect_pool.submit
+        drives_job = submit(self.get_drives)
+        jobs = [drives_job]
+        if slow:
+            nvmes_job = submit(self.get_nvme_drives)
+            pools_job = submit(self.get_pools_from_api)
+            jobs += (nvmes_job, pools_job)
+            if has_shares:
+                smb_connections_job = submit(self.get_smb_connections)
+                smb_shares_job = submit(self.get_smb_shares)
+                nfs_mounts_job = submit(self.get_nfs_mounts)
+                shares_job = submit(self.get_shares)
+                jobs += (smb_connections_job, smb_shares_job, nfs_mounts_job, shares_job)
 
-            shares = self.get_shares()
-            for share in shares:
-                name = share.pop('name')
-                for key, value in share.items():
-                    self.publish_share(name, key, value)
+        try:
+            system = self.get_system_metrics()
+            self.publish_state(MQTT_SYSTEM, system)
+
+            drives = drives_job.result()
+            for drive in drives:
+                bay = drive.pop('bay')
+                self.publish_state(f"{MQTT_HDD}/{bay}", drive)
+
+            if slow:
+                slow_start = len(self._pending_pub)
+                nvmes = nvmes_job.result()
+                for nvme in nvmes:
+                    slot = nvme.pop('slot')
+                    self.publish_state(f"{MQTT_NVME}/{slot}", nvme)
+
+                pools = pools_job.result()
+                for pool in pools:
+                    pool_num = pool.pop('pool')
+                    self.publish_state(f"{MQTT_POOL}/{pool_num}", pool)
+
+                if has_shares:
+                    smb_connections = smb_connections_job.result()
+                    smb_shares = smb_shares_job.result()
+
+                    smb_data = {
+                        'count': len(smb_shares),
+                        'clients': []
+                    }
+
+                    for share in smb_shares:
+                        conn = smb_connections.get(share['pid'], {})
+                        smb_data['clients'].append({
+                            'username': conn.get('username', 'unknown'),
+                            'ip': share['ip'],
+                            'share': share['share']
+                        })
+
+                    self.queue_publish(f"{MQTT_SMB}/connections", str(smb_data['count']))
+                    self.queue_publish(f"{MQTT_SMB}/clients", json.dumps(smb_data['clients']))
+
+                    nfs_mounts = nfs_mounts_job.result()
+                    nfs_data = {
+                        'count': len(nfs_mounts),
+                        'clients': nfs_mounts
+                    }
+
+                    self.queue_publish(f"{MQTT_NFS}/mounts", str(nfs_data['count']))
+                    self.queue_publish(f"{MQTT_NFS}/clients", json.dumps(nfs_data['clients']))
+
+                    shares = shares_job.result()
+                    for share in shares:
+                        name = share.pop('name')
+                        for key, value in share.items():
+                            self.publish_share(name, key, value)
+
+                self._slow_pub = self._pending_pub[slow_start:]
+                self._nvme_temps = [n.get('temperature', 0) for n in nvmes if 'temperature' in n]
+            else:
+                # queue the last slow values again so they keep their republish heartbeat in HA
+                self._pending_pub.extend(self._slow_pub)
+        finally:
+            # if a job raised, the rest must not keep running into the next cycle
+            for job in jobs:
+                job.cancel()
+            wait(jobs)
 
         drive_temps = [d.get('temperature', 0) for d in drives if 'temperature' in d]
-        nvme_temps = [n.get('temperature', 0) for n in nvmes if 'temperature' in n]
-        
+        nvme_temps = self._nvme_temps
+
         hdd_str = ', '.join(f"{t}°C" for t in drive_temps) if drive_temps else "no drives"
         nvme_str = f" | NVMe {', '.join(f'{t}°C' for t in nvme_temps)}" if nvme_temps else ""
 
@@ -845,6 +947,9 @@ class UNASMonitor:
         except OSError:
             pass
 
+        # give the first cpu/disk sample at least a second of counters if mqtt connected quickly
+        time.sleep(max(0.0, self.prev_time + 1.0 - time.time()))
+
         while True:
             try:
                 self.collect_and_publish()
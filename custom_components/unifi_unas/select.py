@@ -6,16 +6,16 @@ from homeassistant.components import mqtt
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import UNASDataUpdateCoordinator
-from .const import CONF_DEVICE_MODEL, DOMAIN, get_device_info, get_mqtt_topics
+from .const import CONF_DEVICE_MODEL, DOMAIN
 from .fan_mode import FanModeMixin
 
 DEFAULT_FAN_SPEED_50_PCT = 128
+# set speed payloads for every valid pwm value
+_PWM_STR = tuple(str(pwm) for pwm in range(256))
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +30,17 @@ RESPONSE_RELAXED = "Relaxed"
 RESPONSE_BALANCED = "Balanced"
 RESPONSE_AGGRESSIVE = "Aggressive"
 
+# options after the device specific managed mode
+FAN_MODE_TAIL_OPTIONS = (MODE_CUSTOM_CURVE, MODE_TARGET_TEMP, MODE_SET_SPEED)
+
+# mqtt payload -> option; anything else is managed (or set speed for a pwm value),
+# max and balanced respectively
+FAN_MODE_OPTIONS = {"auto": MODE_CUSTOM_CURVE, "target_temp": MODE_TARGET_TEMP}
+FAN_MODE_PAYLOADS = {MODE_CUSTOM_CURVE: "auto", MODE_TARGET_TEMP: "target_temp"}
+TEMP_METRIC_OPTIONS = {"avg": TEMP_METRIC_AVG}
+RESPONSE_OPTIONS = {"relaxed": RESPONSE_RELAXED, "aggressive": RESPONSE_AGGRESSIVE}
+RESPONSE_PAYLOADS = {RESPONSE_RELAXED: "relaxed", RESPONSE_BALANCED: "balanced", RESPONSE_AGGRESSIVE: "aggressive"}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -44,71 +55,73 @@ async def async_setup_entry(
     ])
 
 
-class UNASFanModeSelect(CoordinatorEntity, SelectEntity, RestoreEntity):
+class UNASFanModeSelect(CoordinatorEntity, SelectEntity):
+    __slots__ = ("_mode_topic", "_current_option", "_last_pwm", "_unsubscribe", "_mode_managed")
+
     def __init__(self, coordinator: UNASDataUpdateCoordinator, hass: HomeAssistant) -> None:
         super().__init__(coordinator)
         self.hass = hass
-        self._topics = get_mqtt_topics(coordinator.entry.entry_id)
+        self._mode_topic = coordinator.topics["fan_mode"]
         self._attr_has_entity_name = True
         self._attr_name = "Fan Mode"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_fan_mode"
         self._attr_icon = "mdi:fan-auto"
-        self._current_option = None
         self._last_pwm = None
+        self._attr_extra_state_attributes = {}
         self._unsubscribe = None
 
-        device_name, device_model = get_device_info(coordinator.entry.data)
         base_type = "UNVR" if coordinator.entry.data[CONF_DEVICE_MODEL].startswith("UNVR") else "UNAS"
         self._mode_managed = f"{base_type} Managed"
-        self._attr_options = [self._mode_managed, MODE_CUSTOM_CURVE, MODE_TARGET_TEMP, MODE_SET_SPEED]
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._current_option = self._mode_managed
+        self._attr_options = [self._mode_managed, *FAN_MODE_TAIL_OPTIONS]
+        self._attr_device_info = coordinator.device_info
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if (last_state := await self.async_get_last_state()) is not None and last_state.state in self._attr_options:
-            self._current_option = last_state.state
-            self._last_pwm = last_state.attributes.get("last_pwm")
-        else:
-            self._current_option = self._mode_managed
-
-        @callback
-        def message_received(msg):
-            payload = msg.payload
-
-            if payload == "unas_managed":
-                self._current_option = self._mode_managed
-            elif payload == "auto":
-                self._current_option = MODE_CUSTOM_CURVE
-            elif payload == "target_temp":
-                self._current_option = MODE_TARGET_TEMP
-            elif payload.isdigit():
-                self._current_option = MODE_SET_SPEED
-                try:
-                    self._last_pwm = int(payload)
-                except (ValueError, TypeError):
-                    pass
+        # fan_control republishes the mode retained on startup, so there is no need to
+        # restore the last state
+        mqtt_client = self.coordinator.mqtt_client
+        if (mode := mqtt_client.get_value("fan_mode")) is not None:
+            self._apply_mode(str(mode))
+        self._unsubscribe = mqtt_client.add_listener("fan_mode", self._handle_mode_message)
+
+    def _apply_mode(self, payload: str) -> bool:
+        previous = (self._current_option, self._last_pwm)
+        if (option := FAN_MODE_OPTIONS.get(payload)) is None:
+            # a bare pwm value means a fixed speed was set
+            if payload.isdecimal() and (pwm := int(payload)) < 256:
+                self._set_last_pwm(pwm)
+                option = MODE_SET_SPEED
             else:
-                self._current_option = self._mode_managed
+                option = self._mode_managed
+        self._current_option = option
+        return (self._current_option, self._last_pwm) != previous
 
+    @callback
+    def _handle_mode_message(self, payload: str) -> None:
+        if self._apply_mode(payload):
             self.async_write_ha_state()
 
-        self._unsubscribe = await mqtt.async_subscribe(
-            self.hass, f"{self._topics['control']}/fan/mode", message_received, qos=0
-        )
+    def _publish_mode(self, mode: str, selected: tuple, previous: tuple) -> None:
+        # qos 0 has no broker ack to wait for, so selecting returns once this is scheduled
+        self.hass.async_create_task(self._async_publish_mode(mode, selected, previous), eager_start=True)
 
-    async def _publish_mode(self, mode: str) -> None:
+    async def _async_publish_mode(self, mode: str, selected: tuple, previous: tuple) -> None:
         try:
-            await mqtt.async_publish(self.hass, f"{self._topics['control']}/fan/mode", mode, qos=0, retain=True)
+            await mqtt.async_publish(self.hass, self._mode_topic, mode, qos=0, retain=True)
         except Exception as err:
             _LOGGER.error("Failed to publish fan mode: %s", err)
+            # a newer selection or mqtt update since this publish is left alone
+            if (self._current_option, self._last_pwm) == selected != previous:
+                self._current_option = previous[0]
+                self._set_last_pwm(previous[1])
+                self.async_write_ha_state()
 
     async def _ensure_service_running(self) -> None:
+        # trust the last poll when it saw the service running, the next poll catches a crash
+        if self.coordinator.data.get("fan_control_running"):
+            return
         try:
             if not await self.coordinator.ssh_manager.service_running("fan_control"):
                 await self.coordinator.ssh_manager.execute_command("systemctl start fan_control")
@@ -117,120 +130,119 @@ class UNASFanModeSelect(CoordinatorEntity, SelectEntity, RestoreEntity):
 
     @property
     def available(self) -> bool:
-        mqtt_available = self.coordinator.mqtt_client.is_available()
-        service_running = self.coordinator.data.get("fan_control_running", False)
-        has_state = self._current_option is not None
-        return mqtt_available and service_running and has_state
+        return self.coordinator.fan_control_available
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsubscribe:
-            try:
-                self._unsubscribe()
-            except Exception as err:
-                _LOGGER.debug("Error unsubscribing from fan mode: %s", err)
+            self._unsubscribe()
         await super().async_will_remove_from_hass()
 
     @property
     def current_option(self) -> str | None:
         return self._current_option
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        return {"last_pwm": self._last_pwm} if self._last_pwm is not None else {}
+    def _set_last_pwm(self, pwm: int | None) -> None:
+        if pwm != self._last_pwm:
+            self._last_pwm = pwm
+            self._attr_extra_state_attributes = {"last_pwm": pwm} if pwm is not None else {}
 
     async def async_select_option(self, option: str) -> None:
-        await self._ensure_service_running()
+        previous = (self._current_option, self._last_pwm)
+        if option == self._mode_managed:
+            payload = "unas_managed"
+        elif option == MODE_SET_SPEED:
+            current_speed = self.coordinator.mqtt_client.get_value("unas_fan_speed")
+            if current_speed is None:
+                current_speed = DEFAULT_FAN_SPEED_50_PCT
+            self._set_last_pwm(current_speed)
+            payload = (
+                _PWM_STR[current_speed]
+                if isinstance(current_speed, int) and 0 <= current_speed < 256
+                else str(current_speed)
+            )
+        elif (payload := FAN_MODE_PAYLOADS.get(option)) is None:
+            return
 
+        # show the new mode right away, the publish only has to undo it on failure
+        self._current_option = option
+        selected = (option, self._last_pwm)
+        if selected != previous:
+            self.async_write_ha_state()
+
+        await self._ensure_service_running()
+        self._publish_mode(payload, selected, previous)
         if option == self._mode_managed:
-            await self._publish_mode("unas_managed")
+            # runs while the publish is in flight
             try:
                 await self.coordinator.ssh_manager.kick_native_fan_control()
             except Exception as err:
                 _LOGGER.warning("Could not kick native fan control (non-critical): %s", err)
-        elif option == MODE_CUSTOM_CURVE:
-            await self._publish_mode("auto")
-        elif option == MODE_TARGET_TEMP:
-            await self._publish_mode("target_temp")
-        elif option == MODE_SET_SPEED:
-            mqtt_data = self.coordinator.mqtt_client.get_data()
-            current_speed = mqtt_data.get("unas_fan_speed", DEFAULT_FAN_SPEED_50_PCT)
-            self._last_pwm = current_speed
-            await self._publish_mode(str(current_speed))
-
-        self._current_option = option
-        self.async_write_ha_state()
 
 
-class UNASTempMetricSelect(FanModeMixin, CoordinatorEntity, SelectEntity, RestoreEntity):
+class UNASTempMetricSelect(FanModeMixin, CoordinatorEntity, SelectEntity):
     """Select entity for choosing temperature metric (max or average) for Target Temp mode."""
 
+    __slots__ = ("_metric_topic", "_current_option", "_unsubscribe")
+
+    _mode_attribute = True
+
+    # shared by every instance and never mutated; a list so it matches what the
+    # entity registry stores for the options capability
+    _attr_options = [TEMP_METRIC_MAX, TEMP_METRIC_AVG]
+
     def __init__(self, coordinator: UNASDataUpdateCoordinator, hass: HomeAssistant) -> None:
         super().__init__(coordinator)
         self.hass = hass
-        self._topics = get_mqtt_topics(coordinator.entry.entry_id)
+        self._metric_topic = f"{coordinator.topics['fan_curve']}/temp_metric"
         self._attr_has_entity_name = True
         self._attr_name = "Temperature Metric"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_temp_metric"
         self._attr_icon = "mdi:thermometer-lines"
-        self._current_option = None
+        self._current_option = TEMP_METRIC_MAX
         self._unsubscribe = None
 
-        self._attr_options = [TEMP_METRIC_MAX, TEMP_METRIC_AVG]
-
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if (last_state := await self.async_get_last_state()) is not None:
-            if last_state.state in self._attr_options:
-                self._current_option = last_state.state
-            self._current_mode = last_state.attributes.get("current_mode")
-        if self._current_option is None:
-            self._current_option = TEMP_METRIC_MAX
-
-        @callback
-        def message_received(msg):
-            payload = msg.payload
+        mqtt_client = self.coordinator.mqtt_client
+        if (metric := mqtt_client.get_value("fan_curve_temp_metric")) is not None:
+            self._current_option = TEMP_METRIC_OPTIONS.get(str(metric), TEMP_METRIC_MAX)
+        self._unsubscribe = mqtt_client.add_listener("fan_curve_temp_metric", self._handle_metric_message)
 
-            if payload == "avg":
-                self._current_option = TEMP_METRIC_AVG
-            else:
-                self._current_option = TEMP_METRIC_MAX
+        self._subscribe_fan_mode()
 
+    @callback
+    def _handle_metric_message(self, payload: str) -> None:
+        option = TEMP_METRIC_OPTIONS.get(payload, TEMP_METRIC_MAX)
+        if option != self._current_option:
+            self._current_option = option
             self.async_write_ha_state()
 
-        self._unsubscribe = await mqtt.async_subscribe(
-            self.hass, f"{self._topics['control']}/fan/curve/temp_metric", message_received, qos=0
+    def _publish_metric(self, metric: str, previous: str | None) -> None:
+        self.hass.async_create_task(
+            self._async_publish_metric(metric, self._current_option, previous), eager_start=True
         )
 
-        await self._subscribe_fan_mode()
-
-    async def _publish_metric(self, metric: str) -> None:
+    async def _async_publish_metric(self, metric: str, selected: str | None, previous: str | None) -> None:
         try:
             await mqtt.async_publish(
                 self.hass,
-                f"{self._topics['control']}/fan/curve/temp_metric",
+                self._metric_topic,
                 metric,
                 qos=0,
                 retain=True,
             )
         except Exception as err:
             _LOGGER.error("Failed to publish temp metric: %s", err)
+            if self._current_option == selected != previous:
+                self._current_option = previous
+                self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
-        mqtt_available = self.coordinator.mqtt_client.is_available()
-        service_running = self.coordinator.data.get("fan_control_running", False)
-        has_state = self._current_option is not None
-
-        if not (mqtt_available and service_running and has_state):
+        if not self.coordinator.fan_control_available:
             return False
 
         # Only available in Target Temp mode
@@ -238,10 +250,7 @@ class UNASTempMetricSelect(FanModeMixin, CoordinatorEntity, SelectEntity, Restor
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsubscribe:
-            try:
-                self._unsubscribe()
-            except Exception as err:
-                _LOGGER.debug("Error unsubscribing from temp metric: %s", err)
+            self._unsubscribe()
         self._unsubscribe_fan_mode()
         await super().async_will_remove_from_hass()
 
@@ -249,100 +258,77 @@ class UNASTempMetricSelect(FanModeMixin, CoordinatorEntity, SelectEntity, Restor
     def current_option(self) -> str | None:
         return self._current_option
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        attrs = {}
-        if self._current_mode is not None:
-            attrs["current_mode"] = self._current_mode
-        return attrs
-
     async def async_select_option(self, option: str) -> None:
         mqtt_value = "avg" if option == TEMP_METRIC_AVG else "max"
-        await self._publish_metric(mqtt_value)
-
-        self._current_option = option
-        self.async_write_ha_state()
+        previous = self._current_option
+        if option != previous:
+            self._current_option = option
+            self.async_write_ha_state()
+        self._publish_metric(mqtt_value, previous)
 
 
-class UNASResponseSpeedSelect(FanModeMixin, CoordinatorEntity, SelectEntity, RestoreEntity):
+class UNASResponseSpeedSelect(FanModeMixin, CoordinatorEntity, SelectEntity):
     """Select entity for choosing fan response speed preset."""
 
+    __slots__ = ("_speed_topic", "_current_option", "_unsubscribe")
+
+    _mode_attribute = True
+
+    _attr_options = [RESPONSE_RELAXED, RESPONSE_BALANCED, RESPONSE_AGGRESSIVE]
+
     def __init__(self, coordinator: UNASDataUpdateCoordinator, hass: HomeAssistant) -> None:
         super().__init__(coordinator)
         self.hass = hass
-        self._topics = get_mqtt_topics(coordinator.entry.entry_id)
+        self._speed_topic = f"{coordinator.topics['fan_curve']}/response_speed"
         self._attr_has_entity_name = True
         self._attr_name = "Response Speed"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_response_speed"
         self._attr_icon = "mdi:speedometer"
-        self._current_option = None
+        self._current_option = RESPONSE_BALANCED
         self._unsubscribe = None
 
-        self._attr_options = [RESPONSE_RELAXED, RESPONSE_BALANCED, RESPONSE_AGGRESSIVE]
-
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if (last_state := await self.async_get_last_state()) is not None:
-            if last_state.state in self._attr_options:
-                self._current_option = last_state.state
-            self._current_mode = last_state.attributes.get("current_mode")
-        if self._current_option is None:
-            self._current_option = RESPONSE_BALANCED
-
-        @callback
-        def message_received(msg):
-            payload = msg.payload
-
-            if payload == "relaxed":
-                self._current_option = RESPONSE_RELAXED
-            elif payload == "aggressive":
-                self._current_option = RESPONSE_AGGRESSIVE
-            else:
-                self._current_option = RESPONSE_BALANCED
+        mqtt_client = self.coordinator.mqtt_client
+        if (speed := mqtt_client.get_value("fan_curve_response_speed")) is not None:
+            self._current_option = RESPONSE_OPTIONS.get(str(speed), RESPONSE_BALANCED)
+        self._unsubscribe = mqtt_client.add_listener("fan_curve_response_speed", self._handle_speed_message)
 
+        self._subscribe_fan_mode()
+
+    @callback
+    def _handle_speed_message(self, payload: str) -> None:
+        option = RESPONSE_OPTIONS.get(payload, RESPONSE_BALANCED)
+        if option != self._current_option:
+            self._current_option = option
             self.async_write_ha_state()
 
-        self._unsubscribe = await mqtt.async_subscribe(
-            self.hass, f"{self._topics['control']}/fan/curve/response_speed", message_received, qos=0
+    def _publish_speed(self, speed: str, previous: str | None) -> None:
+        self.hass.async_create_task(
+            self._async_publish_speed(speed, self._current_option, previous), eager_start=True
         )
 
-        await self._subscribe_fan_mode()
-
-    def _option_to_mqtt(self, option: str) -> str:
-        if option == RESPONSE_RELAXED:
-            return "relaxed"
-        elif option == RESPONSE_AGGRESSIVE:
-            return "aggressive"
-        return "balanced"
-
-    async def _publish_speed(self, speed: str) -> None:
+    async def _async_publish_speed(self, speed: str, selected: str | None, previous: str | None) -> None:
         try:
             await mqtt.async_publish(
                 self.hass,
-                f"{self._topics['control']}/fan/curve/response_speed",
+                self._speed_topic,
                 speed,
                 qos=0,
                 retain=True,
             )
         except Exception as err:
             _LOGGER.error("Failed to publish response speed: %s", err)
+            if self._current_option == selected != previous:
+                self._current_option = previous
+                self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
-        mqtt_available = self.coordinator.mqtt_client.is_available()
-        service_running = self.coordinator.data.get("fan_control_running", False)
-        has_state = self._current_option is not None
-
-        if not (mqtt_available and service_running and has_state):
+        if not self.coordinator.fan_control_available:
             return False
 
         # Only available in Target Temp mode
@@ -350,10 +336,7 @@ class UNASResponseSpeedSelect(FanModeMixin, CoordinatorEntity, SelectEntity, Res
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsubscribe:
-            try:
-                self._unsubscribe()
-            except Exception as err:
-                _LOGGER.debug("Error unsubscribing from response speed: %s", err)
+            self._unsubscribe()
         self._unsubscribe_fan_mode()
         await super().async_will_remove_from_hass()
 
@@ -361,16 +344,9 @@ class UNASResponseSpeedSelect(FanModeMixin, CoordinatorEntity, SelectEntity, Res
     def current_option(self) -> str | None:
         return self._current_option
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        attrs = {}
-        if self._current_mode is not None:
-            attrs["current_mode"] = self._current_mode
-        return attrs
-
     async def async_select_option(self, option: str) -> None:
-        mqtt_value = self._option_to_mqtt(option)
-        await self._publish_speed(mqtt_value)
-
-        self._current_option = option
-        self.async_write_ha_state()
+        previous = self._current_option
+        if option != previous:
+            self._current_option = option
+            self.async_write_ha_state()
+        self._publish_speed(RESPONSE_PAYLOADS.get(option, "balanced"), previous)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import re
 from datetime import datetime, timedelta
@@ -31,7 +32,6 @@ from .const import (
     DOMAIN,
     format_remote_type,
     format_schedule,
-    get_backup_device_info,
     get_device_info,
 )
 
@@ -279,27 +279,35 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
-    coordinator.sensor_add_entities = async_add_entities
+    coordinator.discovery_handlers.extend(
+        functools.partial(discover, coordinator, async_add_entities)
+        for discover in (
+            _discover_and_add_drive_sensors,
+            _discover_and_add_nvme_sensors,
+            _discover_and_add_pool_sensors,
+            _discover_and_add_share_sensors,
+            _discover_and_add_backup_sensors,
+        )
+    )
 
     async def discover_drives():
-        await _discover_and_add_drive_sensors(coordinator, async_add_entities)
-        await _discover_and_add_nvme_sensors(coordinator, async_add_entities)
-        await _discover_and_add_pool_sensors(coordinator, async_add_entities)
-        await _discover_and_add_share_sensors(coordinator, async_add_entities)
-
-        if coordinator.discovered_bays or coordinator.discovered_nvmes or coordinator.discovered_pools:
-            return
-
-        # if drives not found immediately, poll with shorter intervals (12 × 5s = 60s max)
-        for _ in range(12):
-            await asyncio.sleep(5)
+        # if drives not found immediately, rescan whenever new mqtt keys arrive (60s max)
+        new_data = coordinator.new_data_event
+        deadline = hass.loop.time() + 60
+        while True:
+            new_data.clear()
             await _discover_and_add_drive_sensors(coordinator, async_add_entities)
             await _discover_and_add_nvme_sensors(coordinator, async_add_entities)
             await _discover_and_add_pool_sensors(coordinator, async_add_entities)
             await _discover_and_add_share_sensors(coordinator, async_add_entities)
 
             if coordinator.discovered_bays or coordinator.discovered_nvmes or coordinator.discovered_pools:
-                break
+                return
+
+            try:
+                await asyncio.wait_for(new_data.wait(), timeout=deadline - hass.loop.time())
+            except TimeoutError:
+                return
 
     hass.async_create_task(discover_drives())
 
@@ -524,13 +532,7 @@ class UNASSensor(CoordinatorEntity, SensorEntity):
             elif unit == "MiB":
                 self._attr_suggested_unit_of_measurement = UnitOfInformation.GIBIBYTES
 
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -572,13 +574,7 @@ class UNASFanCurveVisualizationSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{coordinator.entry.entry_id}_fan_curve_viz"
         self._attr_icon = "mdi:chart-line"
 
-        device_name, device_model = get_device_info(coordinator.entry.data)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=device_name,
-            manufacturer="Ubiquiti",
-            model=device_model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -913,7 +909,10 @@ async def _discover_and_add_backup_sensors(
     from homeassistant.helpers import entity_registry as er, device_registry as dr
 
     backup_tasks = coordinator.data.get("backup_tasks", [])
-    task_ids = {task["id"] for task in backup_tasks}
+    task_ids = frozenset(coordinator.data.get("backup_task_ids", ()))
+    # only recorded once the entities are reconciled, so a failed pass is retried next poll
+    if coordinator.backup_task_fingerprints.get("sensor") == task_ids:
+        return
 
     entity_reg = er.async_get(coordinator.hass)
     device_reg = dr.async_get(coordinator.hass)
@@ -937,12 +936,14 @@ async def _discover_and_add_backup_sensors(
                 device_reg.async_remove_device(device.id)
                 _LOGGER.info("Removed service device for backup task %s", task_id)
 
-    # clean up orphaned entities from previous sessions
+    # clean up orphaned entities from previous sessions; like the rest of this pass it
+    # only runs on the first poll and when the task set changes
     prefix = f"{entry_id}_backup_"
+    plen = len(prefix)
     for entity in er.async_entries_for_config_entry(entity_reg, entry_id):
-        if entity.domain != "sensor" or not entity.unique_id.startswith(prefix):
+        if entity.domain != "sensor" or not (uid := entity.unique_id).startswith(prefix):
             continue
-        remainder = entity.unique_id[len(prefix):]
+        remainder = uid[plen:]
         for suffix in known_suffixes:
             if remainder.endswith(suffix):
                 task_id = remainder[:-len(suffix)]
@@ -953,6 +954,7 @@ async def _discover_and_add_backup_sensors(
 
     new_tasks = task_ids - coordinator.discovered_backup_task_sensors
     if not new_tasks:
+        coordinator.backup_task_fingerprints["sensor"] = task_ids
         return
 
     _LOGGER.debug("Discovered new backup tasks: %s", sorted(new_tasks))
@@ -974,6 +976,8 @@ async def _discover_and_add_backup_sensors(
         coordinator.discovered_backup_task_sensors.update(new_tasks)
         _LOGGER.info("Added %d sensors for %d new backup tasks", len(entities), len(new_tasks))
 
+    coordinator.backup_task_fingerprints["sensor"] = task_ids
+
 
 class UNASBackupStatusSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator: UNASDataUpdateCoordinator, task: dict) -> None:
@@ -984,7 +988,7 @@ class UNASBackupStatusSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Status"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_status"
         self._attr_icon = "mdi:cloud-sync"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1037,7 +1041,7 @@ class UNASBackupLastRunSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_last_run"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
         self._attr_icon = "mdi:clock-check"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1067,7 +1071,7 @@ class UNASBackupNextRunSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_next_run"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
         self._attr_icon = "mdi:clock-outline"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1101,7 +1105,7 @@ class UNASBackupDurationSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
         self._attr_icon = "mdi:timer-outline"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
         self._cached_duration = None
 
     @property
@@ -1140,7 +1144,7 @@ class UNASBackupDestinationSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Destination"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_destination"
         self._attr_icon = "mdi:cloud-upload"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1167,7 +1171,7 @@ class UNASBackupSourceSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Source"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_source"
         self._attr_icon = "mdi:folder-multiple"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1204,7 +1208,7 @@ class UNASBackupScheduleSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Schedule"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_schedule"
         self._attr_icon = "mdi:calendar-clock"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -1226,7 +1230,7 @@ class UNASBackupNameSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Task name"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_name"
         self._attr_icon = "mdi:tag"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):
@@ -4,18 +4,25 @@ import asyncio
 import json
 import logging
 import shlex
+import time
 from pathlib import Path
 from typing import Optional
 
 import aiofiles
 import asyncssh
 
-from .const import HA_SSH_KEY_PATHS
+from .const import find_default_ssh_key
 
 _LOGGER = logging.getLogger(__name__)
 
 SCRIPTS_DIR = Path(__file__).parent / "scripts"
 SSH_CONNECT_TIMEOUT = 30
+SSH_KEEPALIVE_INTERVAL = 30
+SSH_KEEPALIVE_COUNT_MAX = 3
+# a connection idle longer than this is probed before reuse; keepalives alone take
+# up to interval * count_max to notice a half-open connection
+SSH_IDLE_PROBE_SECONDS = 5
+SSH_PROBE_TIMEOUT = 2
 
 
 class SSHManager:
@@ -45,24 +52,25 @@ class SSHManager:
         self.mqtt_tls = mqtt_tls
         self.mqtt_tls_insecure = mqtt_tls_insecure
         self._conn: Optional[asyncssh.SSHClientConnection] = None
+        self._last_used = 0.0
         self._lock = asyncio.Lock()
 
     async def connect(self) -> None:
         async with self._lock:
             if self._conn:
-                try:
-                    await self._conn.run("true", timeout=2, check=False)
-                    _LOGGER.debug("SSH connection reused")
-                    return
-                except asyncssh.Error:
-                    _LOGGER.debug("SSH connection stale, reconnecting")
-                except asyncio.TimeoutError:
-                    _LOGGER.debug("SSH connection timed out, reconnecting")
-                try:
+                # commands in quick succession reuse the connection without a probe
+                if not self._conn.is_closed():
+                    if time.monotonic() - self._last_used < SSH_IDLE_PROBE_SECONDS:
+                        return
+                    try:
+                        await self._conn.run("true", timeout=SSH_PROBE_TIMEOUT, check=False)
+                        self._last_used = time.monotonic()
+                        return
+                    except (asyncssh.Error, asyncio.TimeoutError):
+                        _LOGGER.debug("SSH connection stale, reconnecting")
                     self._conn.close()
-                    await self._conn.wait_closed()
-                except asyncssh.Error:
-                    pass
+                else:
+                    _LOGGER.debug("SSH connection lost, reconnecting")
                 self._conn = None
 
             _LOGGER.debug("Establishing SSH connection to %s", self.host)
@@ -70,12 +78,9 @@ class SSHManager:
             client_keys = None
             if self.ssh_key:
                 client_keys = [self.ssh_key]
-            elif not self.password:
-                for key_path in HA_SSH_KEY_PATHS:
-                    if key_path.exists():
-                        client_keys = [str(key_path)]
-                        _LOGGER.debug("Using SSH key from %s", key_path)
-                        break
+            elif not self.password and (key_path := find_default_ssh_key()):
+                client_keys = [key_path]
+                _LOGGER.debug("Using SSH key from %s", key_path)
 
             self._conn = await asyncio.wait_for(
                 asyncssh.connect(
@@ -85,9 +90,12 @@ class SSHManager:
                     password=self.password if self.password else None,
                     client_keys=client_keys,
                     known_hosts=None,
+                    keepalive_interval=SSH_KEEPALIVE_INTERVAL,
+                    keepalive_count_max=SSH_KEEPALIVE_COUNT_MAX,
                 ),
                 timeout=SSH_CONNECT_TIMEOUT,
             )
+            self._last_used = time.monotonic()
             _LOGGER.debug("SSH connection established")
 
     async def disconnect(self) -> None:
@@ -97,14 +105,42 @@ class SSHManager:
                 await self._conn.wait_closed()
                 self._conn = None
 
-    async def execute_command(self, command: str) -> tuple[str, str]:
+    async def _get_connection(self) -> asyncssh.SSHClientConnection:
         await self.connect()
         async with self._lock:
             if self._conn is None:
                 raise ConnectionError("SSH connection not established")
-            result = await self._conn.run(command, check=False)
+            return self._conn
+
+    async def _drop_connection(self, conn: asyncssh.SSHClientConnection) -> None:
+        async with self._lock:
+            if self._conn is conn:
+                self._conn = None
+        conn.close()
+
+    async def execute_command(self, command: str) -> tuple[str, str]:
+        # sessions are multiplexed over the shared connection. only a session that
+        # failed to open is retried: once the connection drops mid-command the UNAS
+        # may already have run it (backup tasks, reboots), so that is re-raised
+        conn = await self._get_connection()
+        try:
+            result = await conn.run(command, check=False)
+        except asyncssh.ChannelOpenError:
+            _LOGGER.debug("SSH session failed to open, reconnecting")
+            await self._drop_connection(conn)
+            conn = await self._get_connection()
+            result = await conn.run(command, check=False)
+        except asyncssh.ConnectionLost:
+            await self._drop_connection(conn)
+            raise
+        self._last_used = time.monotonic()
         return getattr(result, "stdout", "") or "", getattr(result, "stderr", "") or ""
 
+    async def execute_command_detached(self, command: str) -> None:
+        # returns as soon as the command is launched, for commands (reboot, shutdown)
+        # that take the connection down before they could report back
+        await self.execute_command(f"nohup sh -c {shlex.quote(command)} >/dev/null 2>&1 &")
+
     async def scripts_installed(self) -> bool:
         stdout, _ = await self.execute_command(
             "test -f /root/unas_monitor.py && test -f /root/fan_control.sh "
@@ -125,6 +161,18 @@ class SSHManager:
         _LOGGER.debug("Service %s running: %s", service_name, running)
         return running
 
+    async def services_running(self, service_names: list[str]) -> dict[str, bool]:
+        safe_names = " ".join(shlex.quote(name) for name in service_names)
+        # prints one state per unit in argument order, exits non-zero if any is inactive
+        stdout, _ = await self.execute_command(f"systemctl is-active {safe_names} 2>/dev/null || true")
+        states = stdout.strip().splitlines()
+        running = {
+            name: index < len(states) and states[index].strip() == "active"
+            for index, name in enumerate(service_names)
+        }
+        _LOGGER.debug("Services running: %s", running)
+        return running
+
     async def kick_native_fan_control(self) -> bool:
         # uhwd (native fan daemon) calculates PID values but doesn't write them to sysfs until it receives an
         # onFanProfileChanged event for some reason. Toggling the fan profile and back triggers this event, kicking uhwd
@@ -213,12 +261,10 @@ class SSHManager:
             raise
 
     async def _upload_file(self, remote_path: str, content: str, executable: bool = False) -> None:
-        async with self._lock:
-            if self._conn is None:
-                raise ConnectionError("SSH connection not established")
-            async with self._conn.start_sftp_client() as sftp:
-                async with sftp.open(remote_path, "w") as remote_file:
-                    await remote_file.write(content)
+        conn = await self._get_connection()
+        async with conn.start_sftp_client() as sftp:
+            async with sftp.open(remote_path, "w") as remote_file:
+                await remote_file.write(content)
 
         if executable:
             safe_path = shlex.quote(remote_path)
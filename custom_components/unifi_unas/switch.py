@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 
 from homeassistant.components.switch import SwitchEntity
@@ -9,7 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import UNASDataUpdateCoordinator
-from .const import DOMAIN, get_backup_device_info
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +21,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: UNASDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    coordinator.switch_add_entities = async_add_entities
+    coordinator.discovery_handlers.append(
+        functools.partial(_discover_and_add_backup_switches, coordinator, async_add_entities)
+    )
 
 
 async def _discover_and_add_backup_switches(
@@ -30,7 +33,10 @@ async def _discover_and_add_backup_switches(
     from homeassistant.helpers import entity_registry as er
 
     backup_tasks = coordinator.data.get("backup_tasks", [])
-    task_ids = {task["id"] for task in backup_tasks}
+    task_ids = frozenset(coordinator.data.get("backup_task_ids", ()))
+    # only recorded once the entities are reconciled, so a failed pass is retried next poll
+    if coordinator.backup_task_fingerprints.get("switch") == task_ids:
+        return
 
     entity_reg = er.async_get(coordinator.hass)
     entry_id = coordinator.entry.entry_id
@@ -43,21 +49,25 @@ async def _discover_and_add_backup_switches(
             if entity_id := entity_reg.async_get_entity_id("switch", DOMAIN, unique_id):
                 entity_reg.async_remove(entity_id)
 
-    # clean up orphaned entities
+    # clean up orphaned entities; like the rest of this pass it only runs on the first
+    # poll and when the task set changes
     prefix = f"{entry_id}_backup_"
     suffix = "_schedule_enabled"
+    plen = len(prefix)
+    slen = len(suffix)
     for entity in er.async_entries_for_config_entry(entity_reg, entry_id):
-        if entity.domain != "switch" or not entity.unique_id.startswith(prefix):
+        if entity.domain != "switch" or not (uid := entity.unique_id).startswith(prefix):
             continue
-        if not entity.unique_id.endswith(suffix):
+        if not uid.endswith(suffix):
             continue
-        task_id = entity.unique_id[len(prefix):-len(suffix)]
+        task_id = uid[plen:-slen]
         if task_id not in task_ids:
             entity_reg.async_remove(entity.entity_id)
             _LOGGER.info("Removed orphaned backup switch %s", entity.entity_id)
 
     new_tasks = task_ids - coordinator.discovered_backup_task_switches
     if not new_tasks:
+        coordinator.backup_task_fingerprints["switch"] = task_ids
         return
 
     entities = []
@@ -70,8 +80,12 @@ async def _discover_and_add_backup_switches(
         coordinator.discovered_backup_task_switches.update(new_tasks)
         _LOGGER.info("Added %d backup schedule switches", len(entities))
 
+    coordinator.backup_task_fingerprints["switch"] = task_ids
+
 
 class BackupScheduleSwitch(CoordinatorEntity, SwitchEntity):
+    __slots__ = ("_task_id", "_task_name")
+
     def __init__(self, coordinator: UNASDataUpdateCoordinator, task: dict) -> None:
         super().__init__(coordinator)
         self._task_id = task["id"]
@@ -80,7 +94,7 @@ class BackupScheduleSwitch(CoordinatorEntity, SwitchEntity):
         self._attr_name = "Schedule enabled"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_backup_{self._task_id}_schedule_enabled"
         self._attr_icon = "mdi:calendar-clock"
-        self._attr_device_info = get_backup_device_info(coordinator.entry.entry_id, coordinator.entry.data, task)
+        self._attr_device_info = coordinator.backup_device_info(task)
 
     @property
     def available(self):